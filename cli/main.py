@@ -7,60 +7,130 @@ Provides command-line interface for job queue management using typer.
 import json
 import sys
 import time
+from collections import defaultdict
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 import typer
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.text import Text
-from rich import box
-
-# Local imports
-sys.path.append(str(Path(__file__).parent.parent))
-from queuectl.job import Job, JobState, validate_job_data
+
+# Local imports (rich tables/panels, workers and the DLQ are imported
+# inside the commands that need them to keep CLI startup fast)
+_PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+if _PROJECT_ROOT not in sys.path:
+    sys.path.append(_PROJECT_ROOT)
+from queuectl.job import Job, JobState, _STATE_BY_VALUE, validate_job_data
 from queuectl.storage import JobStorage
-from queuectl.worker import WorkerManager, get_running_workers
 from queuectl.config import Config
-from queuectl.dlq import DeadLetterQueue
 from queuectl.utils import (
     generate_job_id, validate_command, format_duration, 
     format_timestamp, calculate_age, truncate_string,
-    safe_json_loads, validate_job_id, ColorFormatter
+    safe_json_loads, load_json_file, json_dumps_bytes, validate_job_id,
+    ColorFormatter
 )
 
+# When output is piped, skip rich help formatting, pretty tracebacks and
+# color handling so scripted runs stay cheap and produce plain text
+_INTERACTIVE = sys.stdout.isatty()
+_MARKUP_MODE = "rich" if _INTERACTIVE else None
+
 # Initialize typer app
 app = typer.Typer(
     name="queuectl",
     help="CLI Background Job Queue System",
-    add_completion=False
+    add_completion=False,
+    rich_markup_mode=_MARKUP_MODE,
+    pretty_exceptions_enable=_INTERACTIVE
 )
 
 # Initialize console for rich output
-console = Console()
-
-# Global storage and config (initialized on first use)
-_storage: Optional[JobStorage] = None
-_config: Optional[Config] = None
+console = Console() if _INTERACTIVE else Console(force_terminal=False, no_color=True)
+
+# Pre-rendered, colored state cells for job tables
+_STATE_CELL = {
+    state: f"[{color}]{state.value}[/{color}]"
+    for state, color in (
+        (JobState.PENDING, "yellow"),
+        (JobState.PROCESSING, "blue"),
+        (JobState.COMPLETED, "green"),
+        (JobState.FAILED, "red"),
+        (JobState.DEAD, "magenta"),
+    )
+}
+
+# Output formats for job listings; only "table" goes through rich
+_OUTPUT_FORMATS = ("table", "json", "tsv")
+_TSV_COLUMNS = ("id", "state", "attempts", "max_retries", "priority", "created_at", "command")
+_TSV_ESCAPE = str.maketrans({"\t": " ", "\n": " ", "\r": " "})
+
+# Body of the 'status' panel
+_STATUS_TMPL = """[bold]Job Queue Status[/bold]
+  Pending: {pending}
+  Processing: {processing}
+  Completed: {completed}
+  Failed: {failed}
+  Dead: {dead}
 
+[bold]Workers[/bold]
+  Running: {workers_running}
+  PIDs: {pids}
 
+[bold]Storage[/bold]
+  Directory: {storage_dir}"""
+
+# Descriptions shown by 'config show'
+_CONFIG_DESCRIPTIONS = {
+    'max_retries': 'Maximum number of job retries',
+    'backoff_base': 'Exponential backoff base multiplier',
+    'worker_timeout': 'Job execution timeout (seconds)',
+    'cleanup_completed_after_hours': 'Auto-cleanup completed jobs after hours',
+    'job_lock_timeout': 'Job lock expiration timeout (seconds)',
+    'storage_dir': 'Data storage directory',
+    'log_level': 'Logging verbosity level',
+    'max_workers': 'Maximum number of workers',
+    'max_output_bytes': 'Job output kept per stream (bytes)'
+}
+
+
+@lru_cache(maxsize=None)
 def get_storage() -> JobStorage:
-    """Get or initialize storage instance"""
-    global _storage
-    if _storage is None:
-        _storage = JobStorage()
-    return _storage
+    """Get or initialize storage instance (cached for this invocation)"""
+    return JobStorage()
 
 
+@lru_cache(maxsize=None)
 def get_config() -> Config:
-    """Get or initialize config instance"""
-    global _config
-    if _config is None:
-        storage = get_storage()
-        config_data = storage.get_config()
-        _config = Config(storage.storage_dir, config_data)
-    return _config
+    """Get or initialize config instance (cached for this invocation)"""
+    storage = get_storage()
+    config_data = storage.get_config()
+    return Config(storage.storage_dir, config_data)
+
+
+def check_output_format(output_format: str) -> str:
+    """Validate an --format value"""
+    output_format = output_format.lower()
+    if output_format not in _OUTPUT_FORMATS:
+        print_error(f"Invalid format '{output_format}'. Valid formats: {', '.join(_OUTPUT_FORMATS)}")
+        raise typer.Exit(1)
+    return output_format
+
+
+def write_jobs_plain(jobs: List[Job], output_format: str):
+    """Write jobs to stdout as JSON or TSV in a single write, bypassing rich"""
+    if output_format == "json":
+        payload = json_dumps_bytes([job.to_dict() for job in jobs]) + b"\n"
+    else:
+        lines = ["\t".join(_TSV_COLUMNS)]
+        for job in jobs:
+            record = job.to_dict()
+            lines.append("\t".join(
+                str(record[column]).translate(_TSV_ESCAPE) for column in _TSV_COLUMNS
+            ))
+        payload = ("\n".join(lines) + "\n").encode("utf-8")
+    
+    sys.stdout.buffer.write(payload)
+    sys.stdout.flush()
 
 
 def print_error(message: str):
@@ -78,13 +148,51 @@ def print_warning(message: str):
     console.print(f"[yellow]Warning:[/yellow] {message}")
 
 
+def build_job(data: Any) -> Job:
+    """
+    Validate one job record and build a Job from it.
+    
+    Prints an error and exits if the record is invalid.
+    """
+    # Validate required fields
+    if not isinstance(data, dict) or not validate_job_data(data):
+        print_error("Invalid job data. Required fields: 'command'")
+        raise typer.Exit(1)
+    
+    # Validate command
+    command = data.get('command', '')
+    if not validate_command(command):
+        print_error("Invalid or potentially dangerous command")
+        raise typer.Exit(1)
+    
+    job_id = data.get('id') or generate_job_id()
+    if not validate_job_id(job_id):
+        print_error("Invalid job ID format")
+        raise typer.Exit(1)
+    
+    # Persistent commands read one line per job
+    stdin_payload = data.get('stdin_payload')
+    if stdin_payload is not None and (not isinstance(stdin_payload, str) or '\n' in stdin_payload):
+        print_error("stdin_payload must be a single line of text")
+        raise typer.Exit(1)
+    
+    return Job.create(
+        command=command,
+        job_id=job_id,
+        max_retries=data.get('max_retries', 3),
+        timeout=data.get('timeout'),
+        priority=data.get('priority', 0),
+        stdin_payload=stdin_payload
+    )
+
+
 @app.command()
 def enqueue(
     job_data: str = typer.Argument(..., help="Job data as JSON string or path to JSON file"),
     validate_only: bool = typer.Option(False, "--validate", help="Only validate the job data"),
     file: bool = typer.Option(False, "--file", "-f", help="Treat job_data as a file path")
 ):
-    """Enqueue a new job.
+    """Enqueue a new job, or a batch of jobs given as a JSON array.
     
     Job data should be JSON with at minimum 'command' field.
     Optional fields: id, max_retries, timeout, priority
@@ -92,6 +200,7 @@ def enqueue(
     Examples:
         queuectl enqueue '{"command": "echo hello world"}'
         queuectl enqueue '{"id": "job1", "command": "sleep 5", "max_retries": 5}'
+        queuectl enqueue '[{"command": "echo a"}, {"command": "echo b"}]'
         queuectl enqueue --file job.json
         queuectl enqueue -f job.json
     """
@@ -100,20 +209,17 @@ def enqueue(
         if file or job_data.endswith('.json'):
             # Read from file
             try:
-                import os
-                if not os.path.exists(job_data):
-                    print_error(f"File not found: {job_data}")
-                    raise typer.Exit(1)
-                
-                with open(job_data, 'r', encoding='utf-8') as f:
-                    file_content = f.read()
-                    data = safe_json_loads(file_content)
-                    if data is None:
-                        print_error(f"Invalid JSON format in file: {job_data}")
-                        raise typer.Exit(1)
+                data = load_json_file(job_data)
+            except FileNotFoundError:
+                print_error(f"File not found: {job_data}")
+                raise typer.Exit(1)
             except Exception as e:
                 print_error(f"Error reading file {job_data}: {e}")
                 raise typer.Exit(1)
+            
+            if data is None:
+                print_error(f"Invalid JSON format in file: {job_data}")
+                raise typer.Exit(1)
         else:
             # Parse as JSON string
             data = safe_json_loads(job_data)
@@ -121,64 +227,70 @@ def enqueue(
                 print_error("Invalid JSON format")
                 raise typer.Exit(1)
         
-        # Validate required fields
-        if not validate_job_data(data):
-            print_error("Invalid job data. Required fields: 'command'")
+        # A JSON array enqueues a batch of jobs with a single storage write
+        is_batch = isinstance(data, list)
+        if is_batch and not data:
+            print_error("No jobs to enqueue")
             raise typer.Exit(1)
         
-        # Validate command
-        command = data.get('command', '')
-        if not validate_command(command):
-            print_error("Invalid or potentially dangerous command")
-            raise typer.Exit(1)
+        jobs = [build_job(record) for record in data] if is_batch else [build_job(data)]
         
         if validate_only:
-            print_success("Job data is valid")
+            print_success("Job data is valid" if not is_batch else f"All {len(jobs)} jobs are valid")
             return
         
-        # Create job
-        job_id = data.get('id') or generate_job_id()
-        if not validate_job_id(job_id):
-            print_error("Invalid job ID format")
-            raise typer.Exit(1)
-        
-        job = Job.create(
-            command=command,
-            job_id=job_id,
-            max_retries=data.get('max_retries', 3),
-            timeout=data.get('timeout'),
-            priority=data.get('priority', 0)
-        )
-        
         # Add to storage
         storage = get_storage()
-        if storage.add_job(job):
-            print_success(f"Job '{job.id}' enqueued successfully")
-            console.print(f"Command: {truncate_string(job.command, 80)}")
-        else:
-            print_error(f"Job with ID '{job.id}' already exists")
+        results = storage.add_jobs(jobs)
+        
+        if not is_batch:
+            job = jobs[0]
+            if results[0]:
+                print_success(f"Job '{job.id}' enqueued successfully")
+                console.print(f"Command: {truncate_string(job.command, 80)}")
+            else:
+                print_error(f"Job with ID '{job.id}' already exists")
+                raise typer.Exit(1)
+            return
+        
+        for job, added in zip(jobs, results):
+            if not added:
+                print_error(f"Job with ID '{job.id}' already exists")
+        
+        added_count = sum(results)
+        print_success(f"Enqueued {added_count}/{len(jobs)} jobs")
+        if added_count < len(jobs):
             raise typer.Exit(1)
             
+    except typer.Exit:
+        raise
     except Exception as e:
         print_error(f"Failed to enqueue job: {e}")
         raise typer.Exit(1)
 
 
 # Worker management commands
-worker_app = typer.Typer(name="worker", help="Worker management commands")
+worker_app = typer.Typer(name="worker", help="Worker management commands", rich_markup_mode=_MARKUP_MODE)
 app.add_typer(worker_app)
 
 
 @worker_app.command("start")
 def start_workers(
     count: int = typer.Option(1, "--count", "-c", help="Number of workers to start"),
+    concurrency: int = typer.Option(1, "--concurrency", "-j", help="Jobs each worker runs at once (for I/O-bound jobs)"),
     detach: bool = typer.Option(True, "--detach/--no-detach", help="Run workers in background")
 ):
     """Start worker processes"""
+    from queuectl.worker import WorkerManager, get_running_workers
+    
     if count < 1 or count > 10:
         print_error("Worker count must be between 1 and 10")
         raise typer.Exit(1)
     
+    if concurrency < 1 or concurrency > 256:
+        print_error("Worker concurrency must be between 1 and 256")
+        raise typer.Exit(1)
+    
     storage = get_storage()
     config = get_config()
     
@@ -190,7 +302,7 @@ def start_workers(
     
     try:
         manager = WorkerManager(storage, config)
-        worker_ids = manager.start_workers(count)
+        worker_ids = manager.start_workers(count, concurrency)
         
         print_success(f"Started {len(worker_ids)} worker(s)")
         for worker_id in worker_ids:
@@ -207,6 +319,8 @@ def stop_workers(
     timeout: int = typer.Option(30, "--timeout", help="Graceful shutdown timeout")
 ):
     """Stop all running workers"""
+    from queuectl.worker import WorkerManager, get_running_workers
+    
     storage = get_storage()
     config = get_config()
     
@@ -228,6 +342,10 @@ def stop_workers(
 @worker_app.command("status")
 def worker_status():
     """Show worker status"""
+    from rich import box
+    from rich.table import Table
+    from queuectl.worker import get_running_workers
+    
     storage = get_storage()
     running_pids = get_running_workers(storage.storage_dir)
     
@@ -248,62 +366,66 @@ def worker_status():
 @app.command()
 def status():
     """Show overall system status"""
+    from rich.panel import Panel
+    from queuectl.worker import get_running_workers
+    
     storage = get_storage()
     
     # Get job counts
-    job_counts = storage.get_job_counts()
+    job_counts = storage.get_counts_snapshot()
     
     # Get worker status
     running_pids = get_running_workers(storage.storage_dir)
     
-    # Create status panel
-    status_text = f"""
-[bold]Job Queue Status[/bold]
-  Pending: {job_counts.get('pending', 0)}
-  Processing: {job_counts.get('processing', 0)}
-  Completed: {job_counts.get('completed', 0)}
-  Failed: {job_counts.get('failed', 0)}
-  Dead: {job_counts.get('dead', 0)}
-
-[bold]Workers[/bold]
-  Running: {len(running_pids)}
-  PIDs: {', '.join(map(str, running_pids)) if running_pids else 'None'}
-
-[bold]Storage[/bold]
-  Directory: {storage.storage_dir}
-    """
+    # Create status panel; missing counts default to 0
+    fields = defaultdict(int, job_counts)
+    fields['workers_running'] = len(running_pids)
+    fields['pids'] = ', '.join(map(str, running_pids)) if running_pids else 'None'
+    fields['storage_dir'] = storage.storage_dir
     
-    console.print(Panel(status_text.strip(), title="QueueCTL Status", expand=False))
+    console.print(Panel(_STATUS_TMPL.format_map(fields), title="QueueCTL Status", expand=False))
 
 
 @app.command("list")
 def list_jobs(
     state: Optional[str] = typer.Option(None, "--state", help="Filter by job state"),
     limit: Optional[int] = typer.Option(None, "--limit", help="Limit number of jobs shown"),
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed information")
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed information"),
+    output_format: str = typer.Option("table", "--format", help="Output format: table, json or tsv")
 ):
     """List jobs with optional filtering"""
+    output_format = check_output_format(output_format)
     storage = get_storage()
     
     # Validate state filter
     job_state = None
     if state:
-        try:
-            job_state = JobState(state.lower())
-        except ValueError:
-            valid_states = [s.value for s in JobState]
-            print_error(f"Invalid state '{state}'. Valid states: {', '.join(valid_states)}")
+        job_state = _STATE_BY_VALUE.get(state.lower())
+        if job_state is None:
+            print_error(f"Invalid state '{state}'. Valid states: {', '.join(_STATE_BY_VALUE)}")
             raise typer.Exit(1)
     
     # Get jobs
     jobs = storage.list_jobs(state=job_state, limit=limit)
     
+    if output_format != "table":
+        write_jobs_plain(jobs, output_format)
+        return
+    
     if not jobs:
         console.print("[yellow]No jobs found[/yellow]")
         return
     
+    from rich import box
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.table import Table
+    
+    now = time.time()
+    
     if verbose:
-        # Detailed view
+        # Detailed view, rendered and flushed once for all jobs
+        panels = []
         for job in jobs:
             panel_content = f"""
 [bold]ID:[/bold] {job.id}
@@ -312,14 +434,16 @@ def list_jobs(
 [bold]Attempts:[/bold] {job.attempts}/{job.max_retries}
 [bold]Created:[/bold] {format_timestamp(job.created_at or '')}
 [bold]Updated:[/bold] {format_timestamp(job.updated_at or '')}
-[bold]Age:[/bold] {calculate_age(job.created_at or '')}
+[bold]Age:[/bold] {calculate_age(job.created_at or '', now)}
 """
             if job.error:
                 panel_content += f"[bold]Error:[/bold] {truncate_string(job.error, 100)}\n"
             if job.output:
                 panel_content += f"[bold]Output:[/bold] {truncate_string(job.output, 100)}\n"
             
-            console.print(Panel(panel_content.strip(), title=f"Job {job.id}", expand=False))
+            panels.append(Panel(panel_content.strip(), title=f"Job {job.id}", expand=False))
+        
+        console.print(Group(*panels))
     else:
         # Table view
         table = Table(title=f"Jobs ({len(jobs)} total)", box=box.ROUNDED)
@@ -330,48 +454,56 @@ def list_jobs(
         table.add_column("Age", style="blue")
         
         for job in jobs:
-            state_color = {
-                JobState.PENDING: "yellow",
-                JobState.PROCESSING: "blue", 
-                JobState.COMPLETED: "green",
-                JobState.FAILED: "red",
-                JobState.DEAD: "magenta"
-            }.get(job.state, "white")
-            
             table.add_row(
                 truncate_string(job.id, 20),
                 truncate_string(job.command, 50),
-                f"[{state_color}]{job.state.value}[/{state_color}]",
+                _STATE_CELL.get(job.state, job.state.value),
                 f"{job.attempts}/{job.max_retries}",
-                calculate_age(job.created_at or '')
+                calculate_age(job.created_at or '', now)
             )
         
         console.print(table)
 
 
 # DLQ management commands
-dlq_app = typer.Typer(name="dlq", help="Dead Letter Queue management")
+dlq_app = typer.Typer(name="dlq", help="Dead Letter Queue management", rich_markup_mode=_MARKUP_MODE)
 app.add_typer(dlq_app)
 
 
 @dlq_app.command("list")
 def dlq_list(
     limit: Optional[int] = typer.Option(None, "--limit", help="Limit number of jobs shown"),
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed information")
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Show detailed information"),
+    output_format: str = typer.Option("table", "--format", help="Output format: table, json or tsv")
 ):
     """List jobs in the dead letter queue"""
+    from queuectl.dlq import DeadLetterQueue
+    
+    output_format = check_output_format(output_format)
     storage = get_storage()
     dlq = DeadLetterQueue(storage)
     
     dead_jobs = dlq.list_dead_jobs(limit=limit)
     
+    if output_format != "table":
+        write_jobs_plain(dead_jobs, output_format)
+        return
+    
     if not dead_jobs:
         console.print("[yellow]Dead letter queue is empty[/yellow]")
         return
     
+    from rich import box
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.table import Table
+    
+    now = time.time()
+    
     if verbose:
+        panels = []
         for job in dead_jobs:
-            analysis = dlq.analyze_job_failure(job.id)
+            analysis = dlq.analyze_job(job)
             if analysis:
                 suggestions_text = "\n".join(f"  • {s}" for s in analysis['suggestions'][:3])
                 panel_content = f"""
@@ -382,7 +514,9 @@ def dlq_list(
 [bold]Suggestions:[/bold]
 {suggestions_text}
 """
-                console.print(Panel(panel_content.strip(), title=f"Dead Job {job.id}", expand=False))
+                panels.append(Panel(panel_content.strip(), title=f"Dead Job {job.id}", expand=False))
+        
+        console.print(Group(*panels))
     else:
         table = Table(title=f"Dead Letter Queue ({len(dead_jobs)} jobs)", box=box.ROUNDED)
         table.add_column("ID", style="cyan")
@@ -395,9 +529,9 @@ def dlq_list(
             table.add_row(
                 truncate_string(job.id, 20),
                 truncate_string(job.command, 40),
-                str(job.attempts),
+                f"{job.attempts}",
                 truncate_string(job.error or "Unknown", 30),
-                calculate_age(job.created_at or '')
+                calculate_age(job.created_at or '', now)
             )
         
         console.print(table)
@@ -409,6 +543,8 @@ def dlq_retry(
     reset_attempts: bool = typer.Option(True, "--reset-attempts/--keep-attempts", help="Reset attempt count")
 ):
     """Retry jobs from the dead letter queue"""
+    from queuectl.dlq import DeadLetterQueue
+    
     storage = get_storage()
     dlq = DeadLetterQueue(storage)
     
@@ -422,7 +558,7 @@ def dlq_retry(
     else:
         # Retry all dead jobs
         results = dlq.retry_all_jobs(reset_attempts)
-        successful = sum(1 for success in results.values() if success)
+        successful = sum(results.values())
         total = len(results)
         
         print_success(f"Retried {successful}/{total} jobs from DLQ")
@@ -439,6 +575,8 @@ def dlq_remove(
     confirm: bool = typer.Option(False, "--yes", help="Skip confirmation prompt")
 ):
     """Permanently remove jobs from the dead letter queue"""
+    from queuectl.dlq import DeadLetterQueue
+    
     storage = get_storage()
     dlq = DeadLetterQueue(storage)
     
@@ -467,7 +605,7 @@ def dlq_remove(
                 return
         
         results = dlq.clear_all()
-        successful = sum(1 for success in results.values() if success)
+        successful = sum(results.values())
         total = len(results)
         
         print_success(f"Removed {successful}/{total} jobs from DLQ")
@@ -476,6 +614,9 @@ def dlq_remove(
 @dlq_app.command("stats")
 def dlq_stats():
     """Show DLQ statistics"""
+    from rich.panel import Panel
+    from queuectl.dlq import DeadLetterQueue
+    
     storage = get_storage()
     dlq = DeadLetterQueue(storage)
     
@@ -507,34 +648,26 @@ def dlq_stats():
 
 
 # Configuration commands
-config_app = typer.Typer(name="config", help="Configuration management")
+config_app = typer.Typer(name="config", help="Configuration management", rich_markup_mode=_MARKUP_MODE)
 app.add_typer(config_app)
 
 
 @config_app.command("show")
 def config_show():
     """Show current configuration"""
+    from rich import box
+    from rich.table import Table
+    
     config = get_config()
-    config_data = config.get_all()
+    config_data = config.view()
     
     table = Table(title="Configuration", box=box.ROUNDED)
     table.add_column("Setting", style="cyan")
     table.add_column("Value", style="white")
     table.add_column("Description", style="dim")
     
-    descriptions = {
-        'max_retries': 'Maximum number of job retries',
-        'backoff_base': 'Exponential backoff base multiplier',
-        'worker_timeout': 'Job execution timeout (seconds)',
-        'cleanup_completed_after_hours': 'Auto-cleanup completed jobs after hours',
-        'job_lock_timeout': 'Job lock expiration timeout (seconds)',
-        'storage_dir': 'Data storage directory',
-        'log_level': 'Logging verbosity level',
-        'max_workers': 'Maximum number of workers'
-    }
-    
     for key, value in config_data.items():
-        desc = descriptions.get(key, 'Custom setting')
+        desc = _CONFIG_DESCRIPTIONS.get(key, 'Custom setting')
         table.add_row(key, str(value), desc)
     
     console.print(table)
@@ -555,7 +688,7 @@ def config_set(
         # Try integer
         if value.isdigit() or (value.startswith('-') and value[1:].isdigit()):
             converted_value = int(value)
-        # Try float
+        # Try float; only dotted decimals, so "nan", "inf" and "1e5" stay strings
         elif '.' in value:
             converted_value = float(value)
         # Try boolean
@@ -592,7 +725,7 @@ def config_reset(
     storage = get_storage()
     
     config.reset_to_defaults()
-    storage.update_config(config.get_all())
+    storage.update_config(config.view())
     
     print_success("Configuration reset to defaults")
 
@@ -7,7 +7,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 from queuectl.job import Job, JobState
-import json
+from queuectl.utils import json_dumps_bytes
 
 # Test job creation and serialization
 job = Job.create("echo test", job_id="test")
@@ -21,7 +21,7 @@ print(f"Dict state type: {type(job_dict['state'])}")
 
 # Test JSON serialization
 try:
-    job_json = json.dumps(job_dict)
+    job_json = json_dumps_bytes(job_dict)
     print("✓ JSON serialization successful")
 except Exception as e:
     print(f"✗ JSON serialization failed: {e}")
@@ -34,7 +34,7 @@ job_dict2 = job.to_dict()
 print(f"Updated dict state: {job_dict2['state']}")
 
 try:
-    job_json2 = json.dumps(job_dict2)
+    job_json2 = json_dumps_bytes(job_dict2)
     print("✓ Updated JSON serialization successful")
 except Exception as e:
     print(f"✗ Updated JSON serialization failed: {e}")
\ No newline at end of file
@@ -35,10 +35,10 @@ def demo_basic_functionality():
         Job.create("nonexistent-command", job_id="demo-job-fail", max_retries=2),  # Will fail
     ]
     
-    # Add jobs to storage
-    for job in jobs:
-        success = storage.add_job(job)
-        print(f"   ✓ Added job '{job.id}': {job.command[:50]}...")
+    # Add jobs to storage in a single write
+    results = storage.add_jobs(jobs)
+    for job, success in zip(jobs, results):
+        print(f"   {'✓' if success else '✗'} Added job '{job.id}': {job.command[:50]}...")
     
     print(f"\n2. Current job counts:")
     counts = storage.get_job_counts()
@@ -93,7 +93,7 @@ def demo_basic_functionality():
             print(f"   Dead Job: {job.id} - Error: {job.error}")
         
         print(f"\n   Analyzing failure...")
-        analysis = dlq.analyze_job_failure(dead_jobs[0].id)
+        analysis = dlq.analyze_job(dead_jobs[0])
         if analysis:
             print(f"   Error Type: {analysis['error_analysis']['error_type']}")
             print(f"   Suggestions: {len(analysis['suggestions'])} recommendations")
@@ -8,11 +8,19 @@ and dead letter queue management.
 __version__ = "1.0.0"
 __author__ = "QueueCTL Team"
 
-from .job import Job, JobState
-from .storage import JobStorage
-from .worker import Worker, WorkerManager
-from .config import Config
-from .dlq import DeadLetterQueue
+from importlib import import_module
+
+# Public names are resolved lazily so that importing a single submodule
+# (e.g. queuectl.job from the CLI) does not pull in workers or the DLQ.
+_LAZY_ATTRS = {
+    "Job": ".job",
+    "JobState": ".job",
+    "JobStorage": ".storage",
+    "Worker": ".worker",
+    "WorkerManager": ".worker",
+    "Config": ".config",
+    "DeadLetterQueue": ".dlq",
+}
 
 __all__ = [
     "Job",
@@ -22,4 +30,14 @@ __all__ = [
     "WorkerManager",
     "Config",
     "DeadLetterQueue"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Import public classes on first access"""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
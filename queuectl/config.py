@@ -4,10 +4,118 @@ Configuration management for QueueCTL
 Handles system configuration with defaults and validation.
 """
 
-from typing import Dict, Any, Optional
+import logging
+import sys
+from types import MappingProxyType
+from typing import Callable, Dict, Any, List, Mapping, Optional
 import os
 from pathlib import Path
 
+logger = logging.getLogger(__name__)
+
+
+_DEFAULTS = {
+    'max_retries': 3,
+    'backoff_base': 2.0,
+    'worker_timeout': 300,  # 5 minutes
+    'cleanup_completed_after_hours': 24,
+    'job_lock_timeout': 300,  # 5 minutes
+    'storage_dir': None,  # Will be set to ~/.queuectl if None
+    'log_level': 'INFO',
+    'max_workers': 10,
+    'max_output_bytes': 1024 * 1024  # kept per stream, from the end
+}
+
+_LOG_LEVELS = frozenset({'DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'})
+
+
+def _validate_max_retries(v: Any) -> bool:
+    return isinstance(v, int) and 0 <= v <= 100
+
+
+def _validate_backoff_base(v: Any) -> bool:
+    return isinstance(v, (int, float)) and 1.0 <= v <= 10.0
+
+
+def _validate_worker_timeout(v: Any) -> bool:
+    return isinstance(v, int) and 1 <= v <= 3600
+
+
+def _validate_cleanup_hours(v: Any) -> bool:
+    return isinstance(v, int) and v >= 0
+
+
+def _validate_lock_timeout(v: Any) -> bool:
+    return isinstance(v, int) and 1 <= v <= 3600
+
+
+def _validate_storage_dir(v: Any) -> bool:
+    return isinstance(v, str) or v is None
+
+
+def _validate_log_level(v: Any) -> bool:
+    return isinstance(v, str) and v in _LOG_LEVELS
+
+
+def _validate_max_workers(v: Any) -> bool:
+    return isinstance(v, int) and 1 <= v <= 100
+
+
+def _validate_max_output_bytes(v: Any) -> bool:
+    return isinstance(v, int) and v >= 1024
+
+
+def _intern_log_level(config: Dict[str, Any]):
+    """Share one string object per log level across loaded configs"""
+    log_level = config.get('log_level')
+    if type(log_level) is str:
+        config['log_level'] = sys.intern(log_level)
+
+
+# Type and range validations, keyed by configuration key
+_VALIDATORS = {
+    'max_retries': _validate_max_retries,
+    'backoff_base': _validate_backoff_base,
+    'worker_timeout': _validate_worker_timeout,
+    'cleanup_completed_after_hours': _validate_cleanup_hours,
+    'job_lock_timeout': _validate_lock_timeout,
+    'storage_dir': _validate_storage_dir,
+    'log_level': _validate_log_level,
+    'max_workers': _validate_max_workers,
+    'max_output_bytes': _validate_max_output_bytes
+}
+
+_VALIDATORS_ITEMS = tuple(_VALIDATORS.items())
+
+
+def _invalid_keys(config: Mapping[str, Any]) -> List[str]:
+    """
+    Check a whole configuration mapping against the validator table.
+    
+    Args:
+        config: Configuration mapping, e.g. as loaded from config.json
+        
+    Returns:
+        Keys whose values fail validation
+    """
+    return [
+        key for key, validator in _VALIDATORS_ITEMS
+        if key in config and not validator(config[key])
+    ]
+
+
+_VALIDATION_INFO = MappingProxyType({
+    'max_retries': 'Integer between 0 and 100',
+    'backoff_base': 'Number between 1.0 and 10.0',
+    'worker_timeout': 'Integer between 1 and 3600 seconds',
+    'cleanup_completed_after_hours': 'Non-negative integer',
+    'job_lock_timeout': 'Integer between 1 and 3600 seconds',
+    'storage_dir': 'String path or None',
+    'log_level': 'One of: DEBUG, INFO, WARNING, ERROR, CRITICAL',
+    'max_workers': 'Integer between 1 and 100',
+    'max_output_bytes': 'Integer of at least 1024'
+})
+
 
 class Config:
     """
@@ -16,16 +124,10 @@ class Config:
     Provides default configuration values and methods to get/set configuration.
     """
     
-    DEFAULT_CONFIG = {
-        'max_retries': 3,
-        'backoff_base': 2.0,
-        'worker_timeout': 300,  # 5 minutes
-        'cleanup_completed_after_hours': 24,
-        'job_lock_timeout': 300,  # 5 minutes
-        'storage_dir': None,  # Will be set to ~/.queuectl if None
-        'log_level': 'INFO',
-        'max_workers': 10
-    }
+    __slots__ = ('storage_dir', 'config_file', '_config', '_listeners')
+    
+    # Read-only view of the defaults; never copied unless a Config is built
+    DEFAULT_CONFIG = MappingProxyType(_DEFAULTS)
     
     def __init__(self, storage_dir: Optional[str] = None, config_dict: Optional[Dict[str, Any]] = None):
         """
@@ -41,13 +143,20 @@ class Config:
         self.storage_dir = storage_dir
         self.config_file = Path(storage_dir) / "config.json"
         
-        # Initialize with defaults
-        self._config = self.DEFAULT_CONFIG.copy()
-        self._config['storage_dir'] = storage_dir
+        # Callbacks run after every change, for holders of cached values
+        self._listeners: List[Callable[[], None]] = []
         
-        # Override with provided config
+        # Initialize with defaults and any overrides in a single dict build
         if config_dict:
-            self._config.update(config_dict)
+            invalid = _invalid_keys(config_dict)
+            if invalid:
+                logger.warning("Ignoring invalid configuration values for: %s", ", ".join(invalid))
+                config_dict = {key: value for key, value in config_dict.items() if key not in invalid}
+            
+            self._config = {**_DEFAULTS, 'storage_dir': storage_dir, **config_dict}
+            _intern_log_level(self._config)
+        else:
+            self._config = {**_DEFAULTS, 'storage_dir': storage_dir}
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -78,6 +187,9 @@ class Config:
             return False
         
         self._config[key] = value
+        if key == 'log_level':
+            _intern_log_level(self._config)
+        self._notify_listeners()
         return True
     
     def update(self, config_dict: Dict[str, Any]) -> Dict[str, bool]:
@@ -90,10 +202,30 @@ class Config:
         Returns:
             Dictionary mapping keys to success status
         """
-        results = {}
+        return self.update_bulk(config_dict)
+    
+    def update_bulk(self, config_dict: Dict[str, Any]) -> Dict[str, bool]:
+        """
+        Validate all updates in one pass and apply the valid ones at once.
+        
+        Args:
+            config_dict: Dictionary of configuration updates
+            
+        Returns:
+            Dictionary mapping keys to success status
+        """
+        validators = _VALIDATORS
+        results = {
+            key: key not in validators or validators[key](value)
+            for key, value in config_dict.items()
+        }
         
-        for key, value in config_dict.items():
-            results[key] = self.set(key, value)
+        if all(results.values()):
+            self._config.update(config_dict)
+        else:
+            self._config.update({key: value for key, value in config_dict.items() if results[key]})
+        _intern_log_level(self._config)
+        self._notify_listeners()
         
         return results
     
@@ -106,10 +238,33 @@ class Config:
         """
         return self._config.copy()
     
+    def view(self) -> Mapping[str, Any]:
+        """
+        Get a read-only view of all configuration values without copying.
+        
+        Returns:
+            Live read-only mapping of the configuration
+        """
+        return MappingProxyType(self._config)
+    
     def reset_to_defaults(self):
         """Reset configuration to default values"""
-        self._config = self.DEFAULT_CONFIG.copy()
-        self._config['storage_dir'] = self.storage_dir
+        self._config = {**_DEFAULTS, 'storage_dir': self.storage_dir}
+        self._notify_listeners()
+    
+    def register_listener(self, callback: Callable[[], None]):
+        """
+        Register a callback run after any configuration change.
+        
+        Args:
+            callback: Called without arguments once the change is applied
+        """
+        self._listeners.append(callback)
+    
+    def _notify_listeners(self):
+        """Run the registered change listeners"""
+        for callback in self._listeners:
+            callback()
     
     def _validate_config_value(self, key: str, value: Any) -> bool:
         """
@@ -122,41 +277,19 @@ class Config:
         Returns:
             True if valid, False otherwise
         """
-        # Type and range validations
-        validations = {
-            'max_retries': lambda v: isinstance(v, int) and 0 <= v <= 100,
-            'backoff_base': lambda v: isinstance(v, (int, float)) and 1.0 <= v <= 10.0,
-            'worker_timeout': lambda v: isinstance(v, int) and 1 <= v <= 3600,
-            'cleanup_completed_after_hours': lambda v: isinstance(v, int) and v >= 0,
-            'job_lock_timeout': lambda v: isinstance(v, int) and 1 <= v <= 3600,
-            'storage_dir': lambda v: isinstance(v, str) or v is None,
-            'log_level': lambda v: v in ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'],
-            'max_workers': lambda v: isinstance(v, int) and 1 <= v <= 100
-        }
-        
-        if key in validations:
-            return validations[key](value)
+        validator = _VALIDATORS.get(key)
         
         # Unknown keys are allowed
-        return True
+        return True if validator is None else validator(value)
     
-    def get_validation_info(self) -> Dict[str, str]:
+    def get_validation_info(self) -> Mapping[str, str]:
         """
         Get validation information for configuration keys.
         
         Returns:
-            Dictionary mapping keys to validation descriptions
-        """
-        return {
-            'max_retries': 'Integer between 0 and 100',
-            'backoff_base': 'Number between 1.0 and 10.0',
-            'worker_timeout': 'Integer between 1 and 3600 seconds',
-            'cleanup_completed_after_hours': 'Non-negative integer',
-            'job_lock_timeout': 'Integer between 1 and 3600 seconds',
-            'storage_dir': 'String path or None',
-            'log_level': 'One of: DEBUG, INFO, WARNING, ERROR, CRITICAL',
-            'max_workers': 'Integer between 1 and 100'
-        }
+            Read-only mapping of keys to validation descriptions
+        """
+        return _VALIDATION_INFO
     
     def __getitem__(self, key: str) -> Any:
         """Allow dictionary-style access"""
@@ -172,4 +305,4 @@ class Config:
     
     def __str__(self) -> str:
         """String representation"""
-        return f"Config({dict(self._config)})"
\ No newline at end of file
+        return f"Config({self._config!r})"
\ No newline at end of file
@@ -5,7 +5,10 @@ Handles jobs that have permanently failed and provides mechanisms
 to retry or remove them.
 """
 
-from typing import List, Optional, Dict, Any
+from collections import Counter
+from heapq import nlargest
+from operator import itemgetter
+from typing import Iterator, List, Optional, Dict, Any
 from datetime import datetime, timezone
 import logging
 
@@ -15,6 +18,87 @@ from .storage import JobStorage
 logger = logging.getLogger(__name__)
 
 
+def _error_key(error: str) -> str:
+    """Get the grouping key for an error: its first line, length-limited"""
+    return error.split('\n', 1)[0][:100]
+
+
+def _reset_for_retry(job: Job, reset_attempts: bool):
+    """Put a dead job back to pending, runnable right away"""
+    if reset_attempts:
+        job.attempts = 0
+    
+    job.update_state(JobState.PENDING)
+    job.error = None  # Clear previous error
+    job.retry_at = None  # A DLQ retry is not held back by old backoff
+
+
+_UNKNOWN_ERROR = {
+    'error_type': 'unknown',
+    'likely_cause': 'Unknown error',
+    'is_retryable': False
+}
+
+# Common error patterns, checked in order against the lowercased error.
+# A pattern matches when every group has at least one needle present.
+_ERROR_PATTERNS = (
+    ((('command not found', 'no such file'),), {
+        'error_type': 'command_not_found',
+        'likely_cause': 'Command or file does not exist',
+        'is_retryable': False
+    }),
+    ((('permission denied',),), {
+        'error_type': 'permission_denied',
+        'likely_cause': 'Insufficient permissions',
+        'is_retryable': False
+    }),
+    ((('timeout', 'timed out'),), {
+        'error_type': 'timeout',
+        'likely_cause': 'Command execution timeout',
+        'is_retryable': True
+    }),
+    ((('connection',), ('refused', 'failed')), {
+        'error_type': 'connection_error',
+        'likely_cause': 'Network or service connectivity issue',
+        'is_retryable': True
+    }),
+    ((('out of memory', 'memory error'),), {
+        'error_type': 'memory_error',
+        'likely_cause': 'Insufficient memory',
+        'is_retryable': True
+    }),
+)
+
+# Fix-up suggestions per error type; {timeout} is filled from the job
+_SUGGESTIONS = {
+    'command_not_found': (
+        "Check if the command exists and is in PATH",
+        "Verify file paths are correct",
+        "Install missing dependencies"
+    ),
+    'permission_denied': (
+        "Check file/directory permissions",
+        "Run with appropriate user privileges",
+        "Verify access to required resources"
+    ),
+    'timeout': (
+        "Increase job timeout (currently {timeout})",
+        "Optimize command performance",
+        "Check for hanging processes"
+    ),
+    'connection_error': (
+        "Check network connectivity",
+        "Verify service availability",
+        "Check firewall settings"
+    ),
+    'memory_error': (
+        "Increase available memory",
+        "Optimize command memory usage",
+        "Process data in smaller chunks"
+    ),
+}
+
+
 class DeadLetterQueue:
     """
     Dead Letter Queue management for permanently failed jobs.
@@ -34,6 +118,11 @@ class DeadLetterQueue:
             storage: Job storage instance
         """
         self.storage = storage
+        
+        # Summary of dead jobs, valid while the storage signature matches;
+        # dropped on this instance's own writes
+        self._stats: Optional[Dict[str, Any]] = None
+        self._stats_signature = None
     
     def list_dead_jobs(self, limit: Optional[int] = None) -> List[Job]:
         """
@@ -47,6 +136,15 @@ class DeadLetterQueue:
         """
         return self.storage.list_jobs(state=JobState.DEAD, limit=limit)
     
+    def iter_dead_jobs(self) -> Iterator[Job]:
+        """
+        Iterate over dead jobs lazily, in storage order.
+        
+        Returns:
+            Iterator of dead jobs
+        """
+        return self.storage.iter_jobs(state=JobState.DEAD)
+    
     def get_dead_job(self, job_id: str) -> Optional[Job]:
         """
         Get a specific dead job by ID.
@@ -81,17 +179,27 @@ class DeadLetterQueue:
             logger.warning(f"Job {job_id} not found in DLQ")
             return False
         
-        # Reset job for retry
-        if reset_attempts:
-            job.attempts = 0
+        return self._retry_job_obj(job, reset_attempts)
+    
+    def _retry_job_obj(self, job: Job, reset_attempts: bool = True) -> bool:
+        """
+        Move an already-fetched dead job back to pending.
         
-        job.update_state(JobState.PENDING)
-        job.error = None  # Clear previous error
+        Args:
+            job: Dead job to retry
+            reset_attempts: Whether to reset attempt count
+            
+        Returns:
+            True if job was successfully moved back to pending, False otherwise
+        """
+        job_id = job.id
+        _reset_for_retry(job, reset_attempts)
         
         # Update job in storage
         success = self.storage.update_job(job)
         
         if success:
+            self._stats = None
             logger.info(f"Job {job_id} moved from DLQ back to pending queue")
         else:
             logger.error(f"Failed to update job {job_id} in storage")
@@ -100,7 +208,7 @@ class DeadLetterQueue:
     
     def retry_all_jobs(self, reset_attempts: bool = True) -> Dict[str, bool]:
         """
-        Retry all jobs in the DLQ.
+        Retry all jobs in the DLQ using a single storage write.
         
         Args:
             reset_attempts: Whether to reset attempt counts
@@ -108,13 +216,16 @@ class DeadLetterQueue:
         Returns:
             Dictionary mapping job IDs to retry success status
         """
-        dead_jobs = self.list_dead_jobs()
-        results = {}
+        dead_jobs = []
+        
+        for job in self.iter_dead_jobs():
+            _reset_for_retry(job, reset_attempts)
+            dead_jobs.append(job)
         
-        for job in dead_jobs:
-            results[job.id] = self.retry_job(job.id, reset_attempts)
+        results = self.storage.update_jobs(dead_jobs)
+        self._stats = None
         
-        successful_retries = sum(1 for success in results.values() if success)
+        successful_retries = sum(results.values())
         logger.info(f"Retried {successful_retries}/{len(dead_jobs)} jobs from DLQ")
         
         return results
@@ -135,9 +246,23 @@ class DeadLetterQueue:
             logger.warning(f"Job {job_id} not found in DLQ")
             return False
         
+        return self._remove_job_obj(job)
+    
+    def _remove_job_obj(self, job: Job) -> bool:
+        """
+        Permanently remove an already-fetched dead job.
+        
+        Args:
+            job: Dead job to remove
+            
+        Returns:
+            True if job was removed, False otherwise
+        """
+        job_id = job.id
         success = self.storage.delete_job(job_id)
         
         if success:
+            self._stats = None
             logger.info(f"Job {job_id} permanently removed from DLQ")
         else:
             logger.error(f"Failed to remove job {job_id} from storage")
@@ -146,19 +271,17 @@ class DeadLetterQueue:
     
     def clear_all(self) -> Dict[str, bool]:
         """
-        Remove all jobs from the DLQ.
+        Remove all jobs from the DLQ using a single storage write.
         
         Returns:
             Dictionary mapping job IDs to removal success status
         """
-        dead_jobs = self.list_dead_jobs()
-        results = {}
-        
-        for job in dead_jobs:
-            results[job.id] = self.remove_job(job.id)
+        dead_ids = [job.id for job in self.iter_dead_jobs()]
+        results = self.storage.delete_jobs(dead_ids)
+        self._stats = None
         
-        successful_removals = sum(1 for success in results.values() if success)
-        logger.info(f"Removed {successful_removals}/{len(dead_jobs)} jobs from DLQ")
+        successful_removals = sum(results.values())
+        logger.info(f"Removed {successful_removals}/{len(dead_ids)} jobs from DLQ")
         
         return results
     
@@ -169,9 +292,10 @@ class DeadLetterQueue:
         Returns:
             Dictionary with DLQ statistics
         """
-        dead_jobs = self.list_dead_jobs()
+        stats = self._current_stats()
+        total_jobs = stats['count']
         
-        if not dead_jobs:
+        if not total_jobs:
             return {
                 'total_jobs': 0,
                 'oldest_job': None,
@@ -180,26 +304,14 @@ class DeadLetterQueue:
                 'common_errors': {}
             }
         
-        # Calculate statistics
-        total_jobs = len(dead_jobs)
-        total_attempts = sum(job.attempts for job in dead_jobs)
-        average_attempts = total_attempts / total_jobs if total_jobs > 0 else 0
-        
-        # Find oldest and newest jobs
-        sorted_by_created = sorted(dead_jobs, key=lambda j: j.created_at or "")
-        oldest_job = sorted_by_created[0]
-        newest_job = sorted_by_created[-1]
+        average_attempts = stats['attempts_sum'] / total_jobs
+        oldest_job = stats['oldest']
+        newest_job = stats['newest']
         
-        # Count common errors
-        error_counts = {}
-        for job in dead_jobs:
-            if job.error:
-                # Get first line of error for grouping
-                error_key = job.error.split('\n')[0][:100]  # Limit length
-                error_counts[error_key] = error_counts.get(error_key, 0) + 1
-        
-        # Get top 5 errors
-        common_errors = dict(sorted(error_counts.items(), key=lambda x: x[1], reverse=True)[:5])
+        # Top 5 errors, kept until the error counts change
+        if stats['top_errors'] is None:
+            stats['top_errors'] = nlargest(5, stats['errors'].items(), key=itemgetter(1))
+        common_errors = dict(stats['top_errors'])
         
         return {
             'total_jobs': total_jobs,
@@ -217,6 +329,48 @@ class DeadLetterQueue:
             'common_errors': common_errors
         }
     
+    def _current_stats(self) -> Dict[str, Any]:
+        """
+        Get the cached DLQ summary, rebuilding it if storage changed.
+        
+        Returns:
+            Summary dictionary with count, attempts_sum, errors, top_errors, oldest, newest
+        """
+        # Taken before the scan: a write racing it only causes another rescan
+        signature = self.storage.change_signature()
+        if self._stats is None or self._stats_signature != signature:
+            # Single pass: attempts, error groups and age extremes together
+            total_jobs = 0
+            total_attempts = 0
+            errors = Counter()
+            oldest = newest = None
+            oldest_ns = newest_ns = 0
+            
+            for job in self.iter_dead_jobs():
+                total_jobs += 1
+                total_attempts += job.attempts
+                
+                if job.error:
+                    errors[_error_key(job.error)] += 1
+                
+                created_ns = job.created_ns
+                if oldest is None or created_ns < oldest_ns:
+                    oldest, oldest_ns = job, created_ns
+                if newest is None or created_ns >= newest_ns:
+                    newest, newest_ns = job, created_ns
+            
+            self._stats = {
+                'count': total_jobs,
+                'attempts_sum': total_attempts,
+                'errors': errors,
+                'top_errors': None,
+                'oldest': oldest,
+                'newest': newest
+            }
+            self._stats_signature = signature
+        
+        return self._stats
+    
     def analyze_job_failure(self, job_id: str) -> Optional[Dict[str, Any]]:
         """
         Analyze a specific job failure.
@@ -232,6 +386,18 @@ class DeadLetterQueue:
         if not job:
             return None
         
+        return self.analyze_job(job)
+    
+    def analyze_job(self, job: Job) -> Dict[str, Any]:
+        """
+        Analyze the failure of a dead job the caller already holds.
+        
+        Args:
+            job: Dead job to analyze
+            
+        Returns:
+            Analysis dictionary
+        """
         # Parse error for common patterns
         error_analysis = self._analyze_error(job.error) if job.error else {}
         
@@ -244,7 +410,7 @@ class DeadLetterQueue:
             'updated_at': job.updated_at,
             'final_error': job.error,
             'error_analysis': error_analysis,
-            'suggestions': self._get_failure_suggestions(job)
+            'suggestions': self._get_failure_suggestions(job, error_analysis)
         }
     
     def _analyze_error(self, error: str) -> Dict[str, Any]:
@@ -257,54 +423,23 @@ class DeadLetterQueue:
         Returns:
             Error analysis dictionary
         """
-        analysis = {
-            'error_type': 'unknown',
-            'likely_cause': 'Unknown error',
-            'is_retryable': False
-        }
-        
         error_lower = error.lower()
         
-        # Common error patterns
-        if 'command not found' in error_lower or 'no such file' in error_lower:
-            analysis.update({
-                'error_type': 'command_not_found',
-                'likely_cause': 'Command or file does not exist',
-                'is_retryable': False
-            })
-        elif 'permission denied' in error_lower:
-            analysis.update({
-                'error_type': 'permission_denied',
-                'likely_cause': 'Insufficient permissions',
-                'is_retryable': False
-            })
-        elif 'timeout' in error_lower or 'timed out' in error_lower:
-            analysis.update({
-                'error_type': 'timeout',
-                'likely_cause': 'Command execution timeout',
-                'is_retryable': True
-            })
-        elif 'connection' in error_lower and ('refused' in error_lower or 'failed' in error_lower):
-            analysis.update({
-                'error_type': 'connection_error',
-                'likely_cause': 'Network or service connectivity issue',
-                'is_retryable': True
-            })
-        elif 'out of memory' in error_lower or 'memory error' in error_lower:
-            analysis.update({
-                'error_type': 'memory_error',
-                'likely_cause': 'Insufficient memory',
-                'is_retryable': True
-            })
-        
-        return analysis
+        for groups, analysis in _ERROR_PATTERNS:
+            if all(any(needle in error_lower for needle in group) for group in groups):
+                return dict(analysis)
+        
+        return dict(_UNKNOWN_ERROR)
     
-    def _get_failure_suggestions(self, job: Job) -> List[str]:
+    def _get_failure_suggestions(self, job: Job,
+                                 error_analysis: Optional[Dict[str, Any]] = None) -> List[str]:
         """
         Get suggestions for fixing job failures.
         
         Args:
             job: Failed job
+            error_analysis: Result of _analyze_error for the job's error, if
+                already computed
             
         Returns:
             List of suggestions
@@ -312,39 +447,14 @@ class DeadLetterQueue:
         suggestions = []
         
         if job.error:
-            error_analysis = self._analyze_error(job.error)
+            if error_analysis is None:
+                error_analysis = self._analyze_error(job.error)
             error_type = error_analysis.get('error_type', 'unknown')
             
-            if error_type == 'command_not_found':
-                suggestions.extend([
-                    "Check if the command exists and is in PATH",
-                    "Verify file paths are correct",
-                    "Install missing dependencies"
-                ])
-            elif error_type == 'permission_denied':
-                suggestions.extend([
-                    "Check file/directory permissions",
-                    "Run with appropriate user privileges",
-                    "Verify access to required resources"
-                ])
-            elif error_type == 'timeout':
-                suggestions.extend([
-                    f"Increase job timeout (currently {job.timeout or 'default'})",
-                    "Optimize command performance",
-                    "Check for hanging processes"
-                ])
-            elif error_type == 'connection_error':
-                suggestions.extend([
-                    "Check network connectivity",
-                    "Verify service availability",
-                    "Check firewall settings"
-                ])
-            elif error_type == 'memory_error':
-                suggestions.extend([
-                    "Increase available memory",
-                    "Optimize command memory usage",
-                    "Process data in smaller chunks"
-                ])
+            suggestions.extend(
+                suggestion.format(timeout=job.timeout or 'default')
+                for suggestion in _SUGGESTIONS.get(error_type, ())
+            )
         
         # General suggestions
         if job.attempts >= job.max_retries:
@@ -353,4 +463,4 @@ class DeadLetterQueue:
         suggestions.append("Check command syntax and arguments")
         suggestions.append("Test command manually in same environment")
         
-        return suggestions
\ No newline at end of file
+        return suggestions
@@ -2,12 +2,21 @@
 Job model for QueueCTL system
 """
 
+import functools
 import json
+import sys
+import threading
+import time
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional, Union
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
 
 
 class JobState(Enum):
@@ -19,7 +28,96 @@ class JobState(Enum):
     DEAD = "dead"
 
 
-@dataclass
+# Serialized state value -> member, skipping Enum.__call__ on bulk loads
+_STATE_BY_VALUE = {state.value: state for state in JobState}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Longest delay schedule_retry accepts; longer ones are clamped to it
+_MAX_SCHEDULE_DELAY = 365 * 86400
+
+# (millisecond tick, ISO string) of the last timestamp handed out
+_now_cache = (-1, '')
+
+# Microsecond tick of the last creation timestamp handed out
+_last_created_us = 0
+_created_lock = threading.Lock()
+
+
+def _now_iso() -> str:
+    """
+    Get the current UTC time as an ISO string, at millisecond resolution.
+    
+    Jobs updated within the same millisecond share one formatted string
+    instead of each formatting their own.
+    
+    Returns:
+        ISO 8601 timestamp
+    """
+    global _now_cache
+    tick = time.time_ns() // 1_000_000
+    cached_tick, cached = _now_cache
+    if tick != cached_tick:
+        cached = (_EPOCH + timedelta(milliseconds=tick)).isoformat(timespec='microseconds')
+        _now_cache = (tick, cached)
+    return cached
+
+
+def _creation_stamp() -> str:
+    """
+    Get a creation time that is unique and increasing within this process.
+    
+    Jobs are queued oldest first, so jobs created in the same microsecond
+    get consecutive microseconds instead of sharing one timestamp, which
+    keeps them in creation order.
+    
+    Returns:
+        ISO 8601 timestamp
+    """
+    global _last_created_us
+    with _created_lock:
+        tick = max(time.time_ns() // 1000, _last_created_us + 1)
+        _last_created_us = tick
+    return (_EPOCH + timedelta(microseconds=tick)).isoformat(timespec='microseconds')
+
+
+@functools.lru_cache(maxsize=32, typed=True)
+def _backoff_table(base_delay: float) -> tuple:
+    """Precomputed base_delay ** attempts for the first 64 attempts"""
+    return tuple(base_delay ** attempt for attempt in range(64))
+
+
+def _iso_to_ns(timestamp: str) -> int:
+    """
+    Convert an ISO timestamp to integer nanoseconds since the epoch.
+    
+    Naive timestamps are taken as UTC.
+    
+    Args:
+        timestamp: ISO 8601 timestamp
+        
+    Returns:
+        Nanoseconds since the epoch, or 0 if the timestamp is unparseable
+    """
+    try:
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except (ValueError, AttributeError):
+        return 0
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    delta = dt - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+# created_at -> ns, for ordering; a job's created_at is parsed once, not per comparison
+_created_ns = functools.lru_cache(maxsize=65536)(_iso_to_ns)
+
+
+# Slotted instances drop the per-job __dict__; dataclass grew slots= in 3.10
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Job:
     """
     Job model representing a background task in the queue system.
@@ -36,6 +134,9 @@ class Job:
         error: Error message if job failed
         timeout: Job execution timeout in seconds
         priority: Job priority (higher number = higher priority)
+        retry_at: Earliest time a retried job may run again, if scheduled
+        stdin_payload: Input line for a persistent command process; when set,
+            the command is kept running between jobs and fed one line per job
     """
     id: str
     command: str
@@ -48,11 +149,13 @@ class Job:
     error: Optional[str] = None
     timeout: Optional[int] = None
     priority: int = 0
+    retry_at: Optional[str] = None
+    stdin_payload: Optional[str] = None
     
     def __post_init__(self):
         """Initialize timestamps if not provided"""
         if self.created_at is None:
-            self.created_at = datetime.now(timezone.utc).isoformat()
+            self.created_at = _creation_stamp()
         if self.updated_at is None:
             self.updated_at = self.created_at
     
@@ -84,7 +187,7 @@ class Job:
             output: Job output if available
         """
         self.state = new_state
-        self.updated_at = datetime.now(timezone.utc).isoformat()
+        self.updated_at = _now_iso()
         
         if error is not None:
             self.error = error
@@ -94,7 +197,7 @@ class Job:
     def increment_attempts(self):
         """Increment the number of attempts and update timestamp"""
         self.attempts += 1
-        self.updated_at = datetime.now(timezone.utc).isoformat()
+        self.updated_at = _now_iso()
     
     def should_retry(self) -> bool:
         """
@@ -103,7 +206,12 @@ class Job:
         Returns:
             True if job should be retried, False otherwise
         """
-        return self.attempts < self.max_retries and self.state == JobState.FAILED
+        return self.state is JobState.FAILED and self.attempts < self.max_retries
+    
+    @property
+    def created_ns(self) -> int:
+        """Creation time in ns since the epoch, derived from created_at (0 if unparseable)"""
+        return _created_ns(self.created_at)
     
     def is_terminal_state(self) -> bool:
         """
@@ -112,7 +220,8 @@ class Job:
         Returns:
             True if job is in terminal state, False otherwise
         """
-        return self.state in [JobState.COMPLETED, JobState.DEAD]
+        state = self.state
+        return state is JobState.COMPLETED or state is JobState.DEAD
     
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -121,9 +230,21 @@ class Job:
         Returns:
             Job as dictionary
         """
-        data = asdict(self)
-        data['state'] = self.state.value  # Convert enum to string
-        return data
+        return {
+            'id': self.id,
+            'command': self.command,
+            'state': self.state.value,
+            'attempts': self.attempts,
+            'max_retries': self.max_retries,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'output': self.output,
+            'error': self.error,
+            'timeout': self.timeout,
+            'priority': self.priority,
+            'retry_at': self.retry_at,
+            'stdin_payload': self.stdin_payload
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Job':
@@ -136,11 +257,26 @@ class Job:
         Returns:
             Job instance
         """
-        # Convert state string to enum
-        if 'state' in data and isinstance(data['state'], str):
-            data['state'] = JobState(data['state'])
+        # Convert state string to enum; unknown values still raise ValueError
+        state = data.get('state', JobState.PENDING)
+        if isinstance(state, str):
+            state = _STATE_BY_VALUE.get(state) or JobState(state)
         
-        return cls(**data)
+        return cls(
+            id=data['id'],
+            command=data['command'],
+            state=state,
+            attempts=data.get('attempts', 0),
+            max_retries=data.get('max_retries', 3),
+            created_at=data.get('created_at'),
+            updated_at=data.get('updated_at'),
+            output=data.get('output'),
+            error=data.get('error'),
+            timeout=data.get('timeout'),
+            priority=data.get('priority', 0),
+            retry_at=data.get('retry_at'),
+            stdin_payload=data.get('stdin_payload')
+        )
     
     def to_json(self) -> str:
         """
@@ -149,22 +285,39 @@ class Job:
         Returns:
             Job as JSON string
         """
+        if orjson is not None:
+            return orjson.dumps(self.to_dict(), option=orjson.OPT_INDENT_2).decode('utf-8')
         return json.dumps(self.to_dict(), indent=2)
     
     @classmethod
-    def from_json(cls, json_str: str) -> 'Job':
+    def from_json(cls, json_str: Union[str, bytes]) -> 'Job':
         """
         Create job from JSON string.
         
         Args:
-            json_str: Job data as JSON string
+            json_str: Job data as JSON string or UTF-8 bytes
             
         Returns:
             Job instance
         """
-        data = json.loads(json_str)
+        data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
         return cls.from_dict(data)
     
+    def schedule_retry(self, delay: float, error: Optional[str] = None):
+        """
+        Put the job back to pending, runnable once the delay has passed.
+        
+        Args:
+            delay: Seconds from now before the job may be picked up
+            error: Error message of the failed attempt
+        """
+        # Out-of-range (or NaN) delays would overflow the datetime arithmetic
+        if not 0 <= delay <= _MAX_SCHEDULE_DELAY:
+            delay = _MAX_SCHEDULE_DELAY if delay > 0 else 0
+        
+        self.update_state(JobState.PENDING, error=error)
+        self.retry_at = (datetime.now(timezone.utc) + timedelta(seconds=delay)).isoformat()
+    
     def get_retry_delay(self, base_delay: float = 2.0) -> float:
         """
         Calculate retry delay using exponential backoff.
@@ -175,7 +328,9 @@ class Job:
         Returns:
             Delay in seconds for next retry
         """
-        return base_delay ** self.attempts
+        table = _backoff_table(base_delay)
+        attempts = self.attempts
+        return table[attempts] if 0 <= attempts < len(table) else base_delay ** attempts
     
     def __str__(self) -> str:
         """String representation of the job"""
@@ -207,9 +362,9 @@ def validate_job_data(data: Dict[str, Any]) -> bool:
     
     # Validate state if present
     if 'state' in data:
-        try:
-            JobState(data['state'])
-        except ValueError:
+        state = data['state']
+        if not isinstance(state, JobState) and (
+                not isinstance(state, str) or state not in _STATE_BY_VALUE):
             return False
     
     # Validate attempts and max_retries are non-negative integers
@@ -3,18 +3,70 @@ Storage layer for QueueCTL system
 
 Provides persistent storage for jobs using JSON files with atomic operations
 and file locking to prevent race conditions.
+
+Jobs live in a jobs.json snapshot plus an append-only jobs.jsonl log of
+put/del records; each mutation appends one line and the log is folded back
+into the snapshot once it grows well past it.
 """
 
-import json
+import heapq
 import os
+import queue
 import tempfile
 import threading
 import time
+import weakref
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
 from contextlib import contextmanager
 
-from .job import Job, JobState
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from .job import Job, JobState, _created_ns, _iso_to_ns
+from .utils import json_dumps_bytes, load_json_file, safe_json_loads
+
+# Never compact a log smaller than this, however small the snapshot is
+COMPACT_MIN_BYTES = 256 * 1024
+
+# Compact once the log outgrows the snapshot by this factor
+COMPACT_RATIO = 4
+
+# Most queued writes the flusher commits with a single append and fsync
+FLUSH_MAX_BATCH = 256
+
+# fdatasync skips the metadata flush fsync does; not available everywhere
+_datasync = getattr(os, 'fdatasync', os.fsync)
+
+# Live storages, so a forked child can reset state it must not share
+_INSTANCES: 'weakref.WeakSet[JobStorage]' = weakref.WeakSet()
+
+
+def _listing_key(job_data: Dict) -> Tuple[int, int]:
+    """Sort key for job records: highest priority first, then oldest"""
+    return (-job_data.get('priority', 0), _created_ns(job_data.get('created_at')))
+
+
+def _pending_entry(job_id: str, job_data: Dict) -> Tuple[int, int, str]:
+    """Pending heap entry for a job record: its listing key, then its ID"""
+    return (-job_data.get('priority', 0), _created_ns(job_data.get('created_at')), job_id)
+
+
+class _PendingWrite:
+    """A queued storage mutation and the caller waiting on its outcome"""
+    
+    __slots__ = ('apply', 'unlock', 'result', 'error', 'done')
+    
+    def __init__(self, apply: Callable[[Dict[str, Dict], List[Dict]], Any],
+                 unlock: Optional[Tuple[str, str]] = None):
+        self.apply = apply
+        self.unlock = unlock
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
 
 
 class JobStorage:
@@ -42,14 +94,59 @@ class JobStorage:
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         
         self.jobs_file = self.storage_dir / "jobs.json"
+        self.jobs_log = self.storage_dir / "jobs.jsonl"
         self.locks_file = self.storage_dir / "locks.json"
         self.config_file = self.storage_dir / "config.json"
         
         # Thread-local lock for preventing concurrent access within same process
         self._thread_lock = threading.RLock()
         
+        # Append handle for the jobs log, opened on first write
+        self._log_fh = None
+        
+        # Open lock sidecar descriptors and how deeply each is held
+        self._lock_fds: Dict[Path, int] = {}
+        self._lock_depth: Dict[Path, int] = {}
+        
+        # Job writes are queued for a background flusher that commits
+        # whatever has accumulated with one append and one fsync
+        self._pending: 'queue.Queue[Optional[_PendingWrite]]' = queue.Queue()
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_lock = threading.Lock()
+        
+        # In-memory image of all jobs, valid for the snapshot it was loaded
+        # from plus the log up to _log_pos; refreshed under the file lock
+        self._jobs: Optional[Dict[str, Dict]] = None
+        self._snapshot_sig: Tuple[int, int, int] = (0, 0, 0)
+        self._log_pos = 0
+        
+        # Min-heap of (-priority, created_ns, job_id) for pending jobs in the
+        # image. Entries are never removed eagerly: ones that no longer match
+        # the cached job are dropped when they reach the top.
+        self._pending_heap: List[Tuple[int, int, str]] = []
+        
+        # Min-heap of (retry_at in ns, job_id) for pending jobs whose retry is
+        # scheduled in the future; moved to the pending heap once due
+        self._delayed_heap: List[Tuple[int, str]] = []
+        
+        # State value -> IDs of the jobs in that state, kept in step with the image
+        self._by_state: Dict[str, Set[str]] = {state.value: set() for state in JobState}
+        
+        # Min-heap of (timestamp, job_id) over locks.json, valid while the
+        # file still has the signature recorded after our last read or write.
+        # Released or re-taken locks leave stale entries that the sweep skips.
+        self._lock_heap: List[Tuple[float, str]] = []
+        self._lock_heap_sig: Tuple[int, int, int] = (0, 0, 0)
+        
+        # Cached job counts, keyed by the change signature they were computed from
+        self._counts_cache: Optional[Tuple[Tuple, Dict[str, int]]] = None
+        
+        # Callbacks run when jobs become runnable through this instance
+        self._notifiers: List[Callable[[], None]] = []
+        
         # Initialize files if they don't exist
         self._initialize_files()
+        _INSTANCES.add(self)
     
     def _initialize_files(self):
         """Initialize storage files with empty data if they don't exist"""
@@ -57,7 +154,7 @@ class JobStorage:
             self._write_json_file(self.jobs_file, {})
         
         if not self.locks_file.exists():
-            self._write_json_file(self.locks_file, {})
+            self._write_json_file(self.locks_file, {}, durable=False)
         
         if not self.config_file.exists():
             default_config = {
@@ -71,35 +168,58 @@ class JobStorage:
     @contextmanager
     def _file_lock(self, file_path: Path):
         """
-        Simple file locking using lock directories.
+        Exclusive OS-level lock on a sidecar file next to file_path.
+        
+        Uses flock on POSIX, which blocks in the kernel and is released
+        automatically if the holder dies, so no timeout is needed. On
+        Windows msvcrt.locking retries for about a second per call; give
+        up after 30 seconds.
+        
+        Must be called with the thread lock held. Nested acquisitions of
+        the same file are counted and only the outermost one locks.
         
         Args:
             file_path: Path to file to lock
         """
-        lock_dir = file_path.with_suffix(file_path.suffix + '.lock')
-        max_wait = 30  # seconds
-        wait_interval = 0.1
-        waited = 0
-        
-        # Try to acquire lock
-        while waited < max_wait:
+        depth = self._lock_depth.get(file_path, 0)
+        if depth:
+            self._lock_depth[file_path] = depth + 1
             try:
-                lock_dir.mkdir(exist_ok=False)
-                break
-            except FileExistsError:
-                time.sleep(wait_interval)
-                waited += wait_interval
+                yield
+            finally:
+                self._lock_depth[file_path] -= 1
+            return
+        
+        fd = self._lock_fds.get(file_path)
+        if fd is None:
+            lock_path = file_path.with_suffix(file_path.suffix + '.lck')
+            fd = self._lock_fds[file_path] = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
         else:
-            raise TimeoutError(f"Could not acquire lock for {file_path} after {max_wait} seconds")
+            max_wait = 30  # seconds
+            deadline = time.monotonic() + max_wait
+            os.lseek(fd, 0, os.SEEK_SET)
+            while True:
+                try:
+                    msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Could not acquire lock for {file_path} after {max_wait} seconds")
         
+        self._lock_depth[file_path] = 1
         try:
             yield
         finally:
+            self._lock_depth[file_path] = 0
             # Release lock
-            try:
-                lock_dir.rmdir()
-            except (FileNotFoundError, OSError):
-                pass
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
     
     def _read_json_file(self, file_path: Path) -> Dict:
         """
@@ -112,47 +232,428 @@ class JobStorage:
             Parsed JSON data or empty dict if file doesn't exist/is invalid
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            return load_json_file(file_path, {})
+        except FileNotFoundError:
             return {}
     
-    def _write_json_file(self, file_path: Path, data: Dict):
+    def _write_json_file(self, file_path: Path, data: Dict, durable: bool = True):
         """
         Write JSON file atomically using temporary file.
         
         Args:
             file_path: Path to JSON file
             data: Data to write
+            durable: Sync the data and the rename to disk before returning.
+                Off for lock bookkeeping, which expires on its own anyway.
         """
-        # Ensure all job states are serialized properly
-        if file_path.name == "jobs.json":
-            serialized_data = {}
-            for key, value in data.items():
-                if isinstance(value, dict) and 'state' in value:
-                    # Make sure state is a string, not an enum
-                    if hasattr(value['state'], 'value'):
-                        value = value.copy()
-                        value['state'] = value['state'].value
-                serialized_data[key] = value
-            data = serialized_data
-        
-        # Write to temporary file first
+        # Write compact JSON bytes to a temporary file first
         with tempfile.NamedTemporaryFile(
-            mode='w', 
-            dir=self.storage_dir, 
-            delete=False,
-            encoding='utf-8'
+            mode='wb',
+            dir=self.storage_dir,
+            delete=False
         ) as tmp_file:
-            json.dump(data, tmp_file, indent=2, ensure_ascii=False)
+            tmp_file.write(json_dumps_bytes(data))
             tmp_file_path = tmp_file.name
+            
+            # Contents must be on disk before the rename can expose them
+            if durable:
+                tmp_file.flush()
+                _datasync(tmp_file.fileno())
+        
+        # Atomic move to final location; os.replace overwrites on Windows too
+        os.replace(tmp_file_path, file_path)
+        
+        if durable:
+            self._sync_dir()
+    
+    def _sync_dir(self):
+        """Persist renames and new files in the storage directory (POSIX only)"""
+        if os.name == 'nt':
+            return
+        
+        dir_fd = os.open(self.storage_dir, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    
+    def close(self):
+        """Stop the flusher and close the jobs log handle and lock files, if open"""
+        with self._flusher_lock:
+            if self._flusher is not None:
+                self._pending.put(None)
+                self._flusher.join()
+                self._flusher = None
+        
+        with self._thread_lock:
+            if self._log_fh is not None:
+                self._log_fh.close()
+                self._log_fh = None
+            
+            for fd in self._lock_fds.values():
+                os.close(fd)
+            self._lock_fds.clear()
+    
+    def _reset_after_fork(self):
+        """
+        Drop per-process state inherited through fork.
+        
+        Inherited lock descriptors share their open file description (and
+        so their flock) with the parent, threads do not survive the fork,
+        and locks may have been held by parent threads at fork time.
+        """
+        self._thread_lock = threading.RLock()
+        self._flusher_lock = threading.Lock()
+        self._pending = queue.Queue()
+        self._flusher = None
+        
+        for fd in self._lock_fds.values():
+            os.close(fd)
+        self._lock_fds = {}
+        self._lock_depth = {}
+        
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+    
+    def _submit(self, apply: Callable[[Dict[str, Dict], List[Dict]], Any],
+                unlock: Optional[Tuple[str, str]] = None) -> Any:
+        """
+        Queue a job mutation for the flusher and wait until it is durable.
+        
+        Args:
+            apply: Called under the jobs lock with the cached jobs and a list
+                to extend with log records; its return value is passed back
+            unlock: Optional (job_id, worker_id) lock to release once the
+                mutation is durable
+            
+        Returns:
+            Whatever apply returned
+        """
+        write = _PendingWrite(apply, unlock)
+        
+        with self._flusher_lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._flush_loop, name="queuectl-storage-flusher", daemon=True
+                )
+                self._flusher.start()
+            self._pending.put(write)
+        
+        write.done.wait()
+        if write.error is not None:
+            raise write.error
+        return write.result
+    
+    def _flush_loop(self):
+        """Commit queued writes in batches until a None sentinel arrives"""
+        pending = self._pending
+        
+        while True:
+            write = pending.get()
+            if write is None:
+                return
+            
+            # Everything queued while the previous batch was syncing
+            batch = [write]
+            while len(batch) < FLUSH_MAX_BATCH:
+                try:
+                    write = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if write is None:
+                    pending.put(None)
+                    break
+                batch.append(write)
+            
+            self._flush(batch)
+    
+    def _flush(self, batch: List[_PendingWrite]):
+        """
+        Apply a batch of writes and commit their records together.
+        
+        Args:
+            batch: Queued writes, applied in order
+        """
+        try:
+            with self._thread_lock:
+                with self._file_lock(self.jobs_file):
+                    jobs_data = self._load_jobs()
+                    records = []
+                    
+                    for write in batch:
+                        try:
+                            write.result = write.apply(jobs_data, records)
+                        except Exception as e:
+                            write.error = e
+                    
+                    if records:
+                        self._append_log(records, jobs_data)
+                    
+                    # The batch's locks go in one locks.json rewrite
+                    unlocks = [write for write in batch if write.unlock and write.error is None]
+                    if unlocks:
+                        try:
+                            self._release_locks([write.unlock for write in unlocks])
+                        except Exception as e:
+                            for write in unlocks:
+                                write.error = e
+        except BaseException as e:
+            for write in batch:
+                write.error = e
+        finally:
+            for write in batch:
+                write.done.set()
+    
+    def _load_jobs(self) -> Dict[str, Dict]:
+        """
+        Get all jobs: the snapshot with the log replayed on top.
+        
+        The parsed image is kept between calls. Only log records appended
+        since the last call are applied, and the snapshot is re-read only
+        after it was replaced (i.e. compacted by some process).
+        
+        Must be called with the jobs file lock held. The returned dict is
+        the live cache: callers that change it must also log the change.
+        
+        Returns:
+            Dictionary mapping job IDs to job dictionaries
+        """
+        snapshot_sig = self._file_signature(self.jobs_file)
+        
+        if (self._jobs is None or snapshot_sig != self._snapshot_sig
+                or self._file_signature(self.jobs_log)[1] < self._log_pos):
+            self._jobs = self._read_json_file(self.jobs_file)
+            self._snapshot_sig = snapshot_sig
+            self._rebuild_state_index()
+            self._rebuild_pending_heap()
+            self._log_pos = self._replay_log(self._jobs, 0)
+        else:
+            self._log_pos = self._replay_log(self._jobs, self._log_pos)
+        
+        return self._jobs
+    
+    def _rebuild_state_index(self):
+        """Rebuild the state -> job IDs index from the cached jobs"""
+        pending = JobState.PENDING.value
+        by_state = {state.value: set() for state in JobState}
+        for job_id, job_data in self._jobs.items():
+            by_state.setdefault(job_data.get('state', pending), set()).add(job_id)
+        self._by_state = by_state
+    
+    def _store_cached(self, jobs_data: Dict[str, Dict], job_id: str, job_data: Dict):
+        """
+        Put a job record into the cached jobs, keeping the indexes in step.
+        
+        Args:
+            jobs_data: Cached jobs dictionary
+            job_id: Job ID
+            job_data: Job record
+        """
+        pending = JobState.PENDING.value
+        old = jobs_data.get(job_id)
+        jobs_data[job_id] = job_data
+        
+        new_state = job_data.get('state', pending)
+        if old is not None:
+            old_state = old.get('state', pending)
+            if old_state != new_state:
+                self._by_state[old_state].discard(job_id)
+        self._by_state.setdefault(new_state, set()).add(job_id)
         
-        # Atomic move to final location
-        if os.name == 'nt':  # Windows
-            if file_path.exists():
-                file_path.unlink()
+        self._push_pending(job_id, job_data)
+    
+    def _drop_cached(self, jobs_data: Dict[str, Dict], job_id: str) -> bool:
+        """
+        Remove a job record from the cached jobs and the state index.
+        
+        Stale pending-heap entries are left for _peek_pending to discard.
         
-        Path(tmp_file_path).replace(file_path)
+        Args:
+            jobs_data: Cached jobs dictionary
+            job_id: Job ID
+            
+        Returns:
+            True if the job was cached, False otherwise
+        """
+        old = jobs_data.pop(job_id, None)
+        if old is None:
+            return False
+        
+        self._by_state[old.get('state', JobState.PENDING.value)].discard(job_id)
+        return True
+    
+    def _rebuild_pending_heap(self):
+        """Rebuild the pending and delayed-retry heaps from the cached jobs"""
+        self._pending_heap = []
+        self._delayed_heap = []
+        for job_id, job_data in self._jobs.items():
+            self._push_pending(job_id, job_data, rebuild=False)
+    
+    def _push_pending(self, job_id: str, job_data: Dict, rebuild: bool = True):
+        """
+        Add a job to the pending heap if its cached record is pending.
+        
+        Jobs with a scheduled retry go to the delayed heap instead.
+        
+        Args:
+            job_id: Job ID
+            job_data: Cached job record
+            rebuild: Rebuild the heaps if stale entries piled up
+        """
+        if job_data.get('state') != JobState.PENDING.value:
+            return
+        
+        retry_at = job_data.get('retry_at')
+        if retry_at:
+            heapq.heappush(self._delayed_heap, (_iso_to_ns(retry_at), job_id))
+        else:
+            heapq.heappush(self._pending_heap, _pending_entry(job_id, job_data))
+        
+        # Re-queued jobs leave stale entries behind; keep them bounded
+        if rebuild and len(self._pending_heap) + len(self._delayed_heap) > 2 * len(self._jobs) + 64:
+            self._rebuild_pending_heap()
+    
+    def _put_cached(self, jobs_data: Dict[str, Dict], job: Job) -> Dict:
+        """
+        Store a job in the cached jobs and build its log record.
+        
+        Args:
+            jobs_data: Cached jobs dictionary
+            job: Job to store
+            
+        Returns:
+            Put record for the jobs log
+        """
+        job_dict = job.to_dict()
+        self._store_cached(jobs_data, job.id, job_dict)
+        return {'op': 'put', 'id': job.id, 'job': job_dict}
+    
+    def _peek_pending(self) -> Optional[str]:
+        """
+        Get the ID of the highest-priority, oldest pending job that is due.
+        
+        Stale heap entries met on the way are discarded.
+        
+        Returns:
+            Job ID, or None if no job is pending
+        """
+        heap = self._pending_heap
+        jobs_data = self._jobs
+        pending = JobState.PENDING.value
+        now_ns = time.time_ns()
+        
+        # Promote scheduled retries that have come due
+        delayed = self._delayed_heap
+        while delayed and delayed[0][0] <= now_ns:
+            retry_ns, job_id = heapq.heappop(delayed)
+            job_data = jobs_data.get(job_id)
+            if (job_data is not None and job_data.get('state') == pending
+                    and _iso_to_ns(job_data.get('retry_at') or '') == retry_ns):
+                heapq.heappush(heap, _pending_entry(job_id, job_data))
+        
+        while heap:
+            entry = heap[0]
+            job_id = entry[2]
+            job_data = jobs_data.get(job_id)
+            if (job_data is not None and job_data.get('state') == pending
+                    and _pending_entry(job_id, job_data) == entry):
+                # A retry scheduled since this entry was pushed waits in the delayed heap
+                retry_at = job_data.get('retry_at')
+                if not retry_at or _iso_to_ns(retry_at) <= now_ns:
+                    return job_id
+            heapq.heappop(heap)
+        
+        return None
+    
+    def _replay_log(self, jobs_data: Dict[str, Dict], start: int) -> int:
+        """
+        Apply jobs log records from a byte offset onwards.
+        
+        A torn final line (an append interrupted by a crash) is cut off so
+        the next record starts on a line of its own.
+        
+        Args:
+            jobs_data: Jobs dictionary to apply records to, in place
+            start: Byte offset of the first unapplied record
+            
+        Returns:
+            Byte offset just past the last applied record
+        """
+        try:
+            with open(self.jobs_log, 'rb') as f:
+                f.seek(start)
+                chunk = f.read()
+        except FileNotFoundError:
+            return 0
+        
+        end = chunk.rfind(b'\n') + 1
+        
+        for line in chunk[:end].splitlines():
+            record = safe_json_loads(line)
+            if not isinstance(record, dict):
+                continue
+            
+            op = record.get('op')
+            if op == 'put':
+                self._store_cached(jobs_data, record['id'], record['job'])
+            elif op == 'del':
+                self._drop_cached(jobs_data, record['id'])
+        
+        if end < len(chunk):
+            os.truncate(self.jobs_log, start + end)
+        
+        return start + end
+    
+    def _append_log(self, records: List[Dict], jobs_data: Dict[str, Dict]):
+        """
+        Durably append records to the jobs log, compacting if it grew too large.
+        
+        Must be called with the jobs file lock held.
+        
+        Args:
+            records: Log records ({"op": "put"|"del", "id": ..., ["job": ...]})
+            jobs_data: Jobs dictionary with the records already applied
+        """
+        self._counts_cache = None
+        
+        try:
+            if self._log_fh is None:
+                created = not self.jobs_log.exists()
+                self._log_fh = open(self.jobs_log, 'ab')
+                if created:
+                    self._sync_dir()
+            
+            # One data-only sync per flushed batch
+            self._log_fh.write(b''.join(json_dumps_bytes(record) + b'\n' for record in records))
+            self._log_fh.flush()
+            _datasync(self._log_fh.fileno())
+            
+            # Our own records are already in the cache; skip them on replay
+            log_size = os.fstat(self._log_fh.fileno()).st_size
+            self._log_pos = log_size
+            
+            if log_size > max(COMPACT_MIN_BYTES, COMPACT_RATIO * self._snapshot_sig[1]):
+                self._compact(jobs_data)
+        except BaseException:
+            # The cache may hold changes that never reached disk
+            self._jobs = None
+            raise
+    
+    def _compact(self, jobs_data: Dict[str, Dict]):
+        """
+        Fold the jobs log into a fresh snapshot and empty the log.
+        
+        Records are idempotent, so a crash between the two steps only means
+        the next load replays records the snapshot already contains.
+        
+        Args:
+            jobs_data: Complete current jobs dictionary
+        """
+        self._write_json_file(self.jobs_file, jobs_data)
+        os.truncate(self.jobs_log, 0)
+        self._snapshot_sig = self._file_signature(self.jobs_file)
+        self._log_pos = 0
     
     def add_job(self, job: Job) -> bool:
         """
@@ -164,19 +665,52 @@ class JobStorage:
         Returns:
             True if job was added, False if job ID already exists
         """
-        with self._thread_lock:
-            with self._file_lock(self.jobs_file):
-                jobs_data = self._read_json_file(self.jobs_file)
-                
+        return self.add_jobs([job])[0]
+    
+    def add_jobs(self, jobs: List[Job]) -> List[bool]:
+        """
+        Add several new jobs with a single read and write.
+        
+        Args:
+            jobs: Jobs to add
+            
+        Returns:
+            List of flags, one per job in order: True if the job was added,
+            False if its ID already exists (including earlier in the batch)
+        """
+        def apply(jobs_data: Dict[str, Dict], records: List[Dict]) -> List[bool]:
+            results = []
+            for job in jobs:
                 # Check if job already exists
                 if job.id in jobs_data:
-                    return False
+                    results.append(False)
+                    continue
                 
-                # Add job
-                jobs_data[job.id] = job.to_dict()
-                self._write_json_file(self.jobs_file, jobs_data)
-                
-                return True
+                records.append(self._put_cached(jobs_data, job))
+                results.append(True)
+            return results
+        
+        results = self._submit(apply)
+        if any(results):
+            self._notify()
+        return results
+    
+    def register_notifier(self, callback: Callable[[], None]):
+        """
+        Register a callback run whenever jobs are added or put back to pending.
+        
+        Only writes through this instance trigger it; other processes'
+        writes have to be noticed through change_signature().
+        
+        Args:
+            callback: Called without arguments, after the write is durable
+        """
+        self._notifiers.append(callback)
+    
+    def _notify(self):
+        """Run the registered notifiers"""
+        for callback in self._notifiers:
+            callback()
     
     def get_job(self, job_id: str) -> Optional[Job]:
         """
@@ -190,7 +724,7 @@ class JobStorage:
         """
         with self._thread_lock:
             with self._file_lock(self.jobs_file):
-                jobs_data = self._read_json_file(self.jobs_file)
+                jobs_data = self._load_jobs()
                 
                 if job_id not in jobs_data:
                     return None
@@ -207,17 +741,33 @@ class JobStorage:
         Returns:
             True if job was updated, False if job doesn't exist
         """
-        with self._thread_lock:
-            with self._file_lock(self.jobs_file):
-                jobs_data = self._read_json_file(self.jobs_file)
-                
-                if job.id not in jobs_data:
-                    return False
-                
-                jobs_data[job.id] = job.to_dict()
-                self._write_json_file(self.jobs_file, jobs_data)
-                
-                return True
+        return self.update_jobs([job])[job.id]
+    
+    def finalize_job(self, job: Job, worker_id: str) -> bool:
+        """
+        Store a job's outcome and release the worker's lock on it.
+        
+        The lock is released only once the job is durable, in the same
+        flusher pass, so concurrent workers share a single locks.json
+        rewrite per batch.
+        
+        Args:
+            job: Job to update
+            worker_id: Worker ID releasing the lock
+            
+        Returns:
+            True if job was updated, False if job doesn't exist
+        """
+        def apply(jobs_data: Dict[str, Dict], records: List[Dict]) -> bool:
+            if job.id not in jobs_data:
+                return False
+            records.append(self._put_cached(jobs_data, job))
+            return True
+        
+        updated = self._submit(apply, unlock=(job.id, worker_id))
+        if updated and job.state is JobState.PENDING:
+            self._notify()
+        return updated
     
     def delete_job(self, job_id: str) -> bool:
         """
@@ -229,17 +779,52 @@ class JobStorage:
         Returns:
             True if job was deleted, False if job doesn't exist
         """
-        with self._thread_lock:
-            with self._file_lock(self.jobs_file):
-                jobs_data = self._read_json_file(self.jobs_file)
-                
-                if job_id not in jobs_data:
-                    return False
-                
-                del jobs_data[job_id]
-                self._write_json_file(self.jobs_file, jobs_data)
-                
-                return True
+        return self.delete_jobs([job_id])[job_id]
+    
+    def update_jobs(self, jobs: List[Job]) -> Dict[str, bool]:
+        """
+        Update several existing jobs with a single read and write.
+        
+        Args:
+            jobs: Jobs to update
+            
+        Returns:
+            Dictionary mapping job IDs to update success status
+        """
+        def apply(jobs_data: Dict[str, Dict], records: List[Dict]) -> Dict[str, bool]:
+            results = {}
+            for job in jobs:
+                if job.id in jobs_data:
+                    records.append(self._put_cached(jobs_data, job))
+                    results[job.id] = True
+                else:
+                    results[job.id] = False
+            return results
+        
+        results = self._submit(apply)
+        if any(job.state is JobState.PENDING and results[job.id] for job in jobs):
+            self._notify()
+        return results
+    
+    def delete_jobs(self, job_ids: List[str]) -> Dict[str, bool]:
+        """
+        Delete several jobs with a single read and write.
+        
+        Args:
+            job_ids: Job IDs to delete
+            
+        Returns:
+            Dictionary mapping job IDs to deletion success status
+        """
+        def apply(jobs_data: Dict[str, Dict], records: List[Dict]) -> Dict[str, bool]:
+            results = {}
+            for job_id in job_ids:
+                results[job_id] = self._drop_cached(jobs_data, job_id)
+                if results[job_id]:
+                    records.append({'op': 'del', 'id': job_id})
+            return results
+        
+        return self._submit(apply)
     
     def list_jobs(self, state: Optional[JobState] = None, limit: Optional[int] = None) -> List[Job]:
         """
@@ -254,24 +839,46 @@ class JobStorage:
         """
         with self._thread_lock:
             with self._file_lock(self.jobs_file):
-                jobs_data = self._read_json_file(self.jobs_file)
+                jobs_data = self._load_jobs()
                 
-                jobs = []
-                for job_data in jobs_data.values():
-                    job = Job.from_dict(job_data)
-                    
-                    # Apply state filter
-                    if state is None or job.state == state:
-                        jobs.append(job)
+                # Filter and order the raw records; only survivors become Jobs
+                if state is None:
+                    records = list(jobs_data.values())
+                else:
+                    records = [jobs_data[job_id] for job_id in self._by_state.get(state.value, ())]
                 
                 # Sort by priority (descending) then by created_at (ascending)
-                jobs.sort(key=lambda j: (-j.priority, j.created_at))
-                
-                # Apply limit
-                if limit is not None:
-                    jobs = jobs[:limit]
-                
-                return jobs
+                sort_key = _listing_key
+                if limit is not None and limit < len(records):
+                    records = heapq.nsmallest(max(limit, 0), records, key=sort_key)
+                else:
+                    records.sort(key=sort_key)
+        
+        return [Job.from_dict(job_data) for job_data in records]
+    
+    def iter_jobs(self, state: Optional[JobState] = None) -> Iterator[Job]:
+        """
+        Iterate over jobs lazily, optionally filtered by state.
+        
+        The job records are captured once under the lock; Job instances are
+        only built as the caller consumes them, in storage order (unsorted).
+        
+        Args:
+            state: Optional state filter
+            
+        Yields:
+            Job instances
+        """
+        with self._thread_lock:
+            with self._file_lock(self.jobs_file):
+                jobs_data = self._load_jobs()
+                if state is None:
+                    job_records = list(jobs_data.values())
+                else:
+                    job_records = [jobs_data[job_id] for job_id in self._by_state.get(state.value, ())]
+        
+        for job_data in job_records:
+            yield Job.from_dict(job_data)
     
     def get_job_counts(self) -> Dict[str, int]:
         """
@@ -282,16 +889,57 @@ class JobStorage:
         """
         with self._thread_lock:
             with self._file_lock(self.jobs_file):
-                jobs_data = self._read_json_file(self.jobs_file)
-                
-                counts = {state.value: 0 for state in JobState}
+                self._load_jobs()
                 
-                for job_data in jobs_data.values():
-                    state = job_data.get('state', JobState.PENDING.value)
-                    if state in counts:
-                        counts[state] += 1
-                
-                return counts
+                by_state = self._by_state
+                return {state.value: len(by_state[state.value]) for state in JobState}
+    
+    def get_counts_snapshot(self) -> Dict[str, int]:
+        """
+        Get count of jobs by state, reusing the last result if jobs are unchanged.
+        
+        The cache is dropped on every write from this instance and whenever
+        the jobs files change on disk (e.g. written by another process), so
+        repeated refreshes cost a single stat while the queue is idle.
+        
+        Returns:
+            Dictionary mapping state names to counts
+        """
+        with self._thread_lock:
+            signature = self.change_signature()
+            
+            if self._counts_cache is None or self._counts_cache[0] != signature:
+                self._counts_cache = (signature, self.get_job_counts())
+            
+            return dict(self._counts_cache[1])
+    
+    def change_signature(self) -> Tuple:
+        """
+        Get a token that changes whenever the stored jobs change.
+        
+        Callers can keep derived data (counts, statistics) alongside the
+        token and rebuild it only when the token differs.
+        
+        Returns:
+            Opaque, comparable change token
+        """
+        return (self._file_signature(self.jobs_file), self._file_signature(self.jobs_log))
+    
+    def _file_signature(self, file_path: Path) -> Tuple[int, int, int]:
+        """
+        Get a cheap change signature for a file.
+        
+        Args:
+            file_path: Path to file
+            
+        Returns:
+            Tuple of (inode, size, mtime in ns), or zeros if the file is missing
+        """
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
+            return (0, 0, 0)
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
     
     def get_next_job(self, worker_id: str) -> Optional[Job]:
         """
@@ -305,28 +953,20 @@ class JobStorage:
         """
         with self._thread_lock:
             with self._file_lock(self.jobs_file):
-                jobs_data = self._read_json_file(self.jobs_file)
-                
-                # Find highest priority pending job
-                pending_jobs = []
-                for job_data in jobs_data.values():
-                    if job_data.get('state') == JobState.PENDING.value:
-                        pending_jobs.append(Job.from_dict(job_data))
+                jobs_data = self._load_jobs()
                 
-                if not pending_jobs:
+                # Highest priority (descending), then oldest, pending job
+                job_id = self._peek_pending()
+                if job_id is None:
                     return None
                 
-                # Sort by priority (descending) then by created_at (ascending)
-                pending_jobs.sort(key=lambda j: (-j.priority, j.created_at))
-                job = pending_jobs[0]
+                job = Job.from_dict(jobs_data[job_id])
                 
                 # Lock the job
                 if self._lock_job(job.id, worker_id):
                     # Update job state to processing
                     job.update_state(JobState.PROCESSING)
-                    # Ensure we serialize the job properly
-                    jobs_data[job.id] = job.to_dict()
-                    self._write_json_file(self.jobs_file, jobs_data)
+                    self._append_log([self._put_cached(jobs_data, job)], jobs_data)
                     return job
                 
                 return None
@@ -343,6 +983,7 @@ class JobStorage:
             True if lock acquired, False if already locked
         """
         locks_data = self._read_json_file(self.locks_file)
+        self._sync_lock_heap(locks_data)
         
         # Check if already locked
         if job_id in locks_data:
@@ -353,13 +994,48 @@ class JobStorage:
                 return False
         
         # Acquire lock
+        now = time.time()
         locks_data[job_id] = {
             'worker_id': worker_id,
-            'timestamp': time.time()
+            'timestamp': now
         }
-        self._write_json_file(self.locks_file, locks_data)
+        self._write_locks(locks_data)
+        
+        heapq.heappush(self._lock_heap, (now, job_id))
+        if len(self._lock_heap) > 2 * len(locks_data) + 64:
+            self._rebuild_lock_heap(locks_data)
         return True
     
+    def _rebuild_lock_heap(self, locks_data: Dict[str, Dict]):
+        """Rebuild the lock expiry heap from the current locks"""
+        self._lock_heap = [
+            (lock_info.get('timestamp', 0), job_id)
+            for job_id, lock_info in locks_data.items()
+        ]
+        heapq.heapify(self._lock_heap)
+    
+    def _sync_lock_heap(self, locks_data: Dict[str, Dict]):
+        """
+        Rebuild the lock expiry heap if locks.json changed behind our back.
+        
+        Args:
+            locks_data: Locks as just read from disk
+        """
+        signature = self._file_signature(self.locks_file)
+        if signature != self._lock_heap_sig:
+            self._rebuild_lock_heap(locks_data)
+            self._lock_heap_sig = signature
+    
+    def _write_locks(self, locks_data: Dict[str, Dict]):
+        """
+        Write locks.json and record its signature for the expiry heap.
+        
+        Args:
+            locks_data: Locks to write
+        """
+        self._write_json_file(self.locks_file, locks_data, durable=False)
+        self._lock_heap_sig = self._file_signature(self.locks_file)
+    
     def unlock_job(self, job_id: str, worker_id: str) -> bool:
         """
         Unlock a job.
@@ -371,21 +1047,35 @@ class JobStorage:
         Returns:
             True if lock released, False if not locked by this worker
         """
+        return self._release_locks([(job_id, worker_id)])[job_id]
+    
+    def _release_locks(self, unlocks: List[Tuple[str, str]]) -> Dict[str, bool]:
+        """
+        Release several job locks with a single read and write.
+        
+        Args:
+            unlocks: (job_id, worker_id) pairs to release
+            
+        Returns:
+            Dictionary mapping job IDs to whether their lock was released
+        """
         with self._thread_lock:
             with self._file_lock(self.locks_file):
                 locks_data = self._read_json_file(self.locks_file)
+                self._sync_lock_heap(locks_data)
                 
-                if job_id not in locks_data:
-                    return False
+                results = {}
+                for job_id, worker_id in unlocks:
+                    # Verify worker owns the lock
+                    lock_info = locks_data.get(job_id)
+                    results[job_id] = lock_info is not None and lock_info.get('worker_id') == worker_id
+                    if results[job_id]:
+                        # Release lock; its heap entry goes stale
+                        del locks_data[job_id]
                 
-                # Verify worker owns the lock
-                if locks_data[job_id].get('worker_id') != worker_id:
-                    return False
-                
-                # Release lock
-                del locks_data[job_id]
-                self._write_json_file(self.locks_file, locks_data)
-                return True
+                if any(results.values()):
+                    self._write_locks(locks_data)
+                return results
     
     def cleanup_expired_locks(self, max_age_seconds: int = 300):
         """
@@ -397,21 +1087,23 @@ class JobStorage:
         with self._thread_lock:
             with self._file_lock(self.locks_file):
                 locks_data = self._read_json_file(self.locks_file)
+                self._sync_lock_heap(locks_data)
                 
-                current_time = time.time()
-                expired_locks = []
-                
-                for job_id, lock_info in locks_data.items():
-                    lock_time = lock_info.get('timestamp', 0)
-                    if current_time - lock_time > max_age_seconds:
-                        expired_locks.append(job_id)
+                # Pop locks oldest first, stopping at the first fresh one
+                cutoff = time.time() - max_age_seconds
+                heap = self._lock_heap
+                expired = False
                 
-                # Remove expired locks
-                for job_id in expired_locks:
-                    del locks_data[job_id]
+                while heap and heap[0][0] < cutoff:
+                    lock_time, job_id = heapq.heappop(heap)
+                    lock_info = locks_data.get(job_id)
+                    # Entries for released or re-taken locks no longer match
+                    if lock_info is not None and lock_info.get('timestamp', 0) == lock_time:
+                        del locks_data[job_id]
+                        expired = True
                 
-                if expired_locks:
-                    self._write_json_file(self.locks_file, locks_data)
+                if expired:
+                    self._write_locks(locks_data)
     
     def get_config(self) -> Dict:
         """
@@ -433,4 +1125,13 @@ class JobStorage:
             with self._file_lock(self.config_file):
                 current_config = self._read_json_file(self.config_file)
                 current_config.update(config)
-                self._write_json_file(self.config_file, current_config)
\ No newline at end of file
+                self._write_json_file(self.config_file, current_config)
+
+
+def _reset_instances_after_fork():
+    for storage in list(_INSTANCES):
+        storage._reset_after_fork()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_instances_after_fork)
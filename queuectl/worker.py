@@ -5,14 +5,24 @@ Handles job execution, retry logic with exponential backoff,
 and multi-worker coordination.
 """
 
+import asyncio
+import functools
 import os
+import random
+import re
+import select
+import selectors
+import shutil
 import signal
 import subprocess
+import sys
 import time
 import threading
+import weakref
 import multiprocessing
+import multiprocessing.connection
 from datetime import datetime, timezone
-from typing import Optional, Dict, List
+from typing import Any, Optional, Dict, List, Tuple
 from pathlib import Path
 import logging
 
@@ -25,6 +35,203 @@ from .config import Config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Persistent command processes unused for this long are shut down
+PERSISTENT_IDLE_TIMEOUT = 300
+
+# Longest backoff before a retry, in seconds, whatever backoff_base is
+MAX_RETRY_DELAY = 60
+
+# Anything outside shlex.quote's safe set (plus spaces) may need a shell
+_SHELL_SYNTAX = re.compile(r'[^\w@%+=:,./ -]')
+
+# PATH lookups per program name; a worker's PATH does not change
+_which = functools.lru_cache(maxsize=256)(shutil.which)
+
+
+# Workers told about SIGINT/SIGTERM, and whether the handlers are in place
+_signal_workers: 'weakref.WeakSet[Worker]' = weakref.WeakSet()
+_signal_handlers_installed = False
+
+
+def install_signal_handlers(worker: 'Worker') -> bool:
+    """
+    Have SIGINT and SIGTERM request a graceful shutdown of a worker.
+    
+    The process-wide handlers are installed once, and only from the main
+    thread (signal.signal raises anywhere else). Handlers that were set
+    before are still called afterwards, except Python's default SIGINT
+    handler, whose KeyboardInterrupt would cut the graceful shutdown short.
+    
+    Args:
+        worker: Worker to notify on a shutdown signal
+        
+    Returns:
+        True if the handlers are installed, False if they could not be
+    """
+    global _signal_handlers_installed
+    _signal_workers.add(worker)
+    
+    if not _signal_handlers_installed and threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            previous = signal.getsignal(signum)
+            signal.signal(signum, functools.partial(_handle_shutdown_signal, previous))
+        _signal_handlers_installed = True
+    
+    return _signal_handlers_installed
+
+
+def _handle_shutdown_signal(previous, signum, frame):
+    """Forward a shutdown signal to the workers, then to the previous handler"""
+    for worker in list(_signal_workers):
+        worker._signal_handler(signum, frame)
+    
+    if callable(previous) and previous is not signal.default_int_handler:
+        previous(signum, frame)
+
+
+def _run_capped(args, shell: bool, timeout: float, max_bytes: int) -> Tuple[int, bytes, bytes]:
+    """
+    Run a command, keeping only the last max_bytes of each output stream.
+    
+    Both pipes are drained as output arrives, so the child never blocks on
+    a full pipe, but memory stays bounded however much it writes. Dropped
+    output is replaced by a marker line.
+    
+    Args:
+        args: argv list, or a command string when shell is True
+        shell: Run the command through the shell
+        timeout: Seconds before the command is killed
+        max_bytes: Bytes of output kept per stream
+        
+    Returns:
+        Tuple of (return code, stdout, stderr)
+        
+    Raises:
+        subprocess.TimeoutExpired: If the command outlived the timeout
+    """
+    process = subprocess.Popen(
+        args,
+        shell=shell,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        close_fds=False
+    )
+    deadline = time.monotonic() + timeout
+    streams = (process.stdout, process.stderr)
+    buffers = {stream.fileno(): bytearray() for stream in streams}
+    dropped = dict.fromkeys(buffers, 0)
+    
+    try:
+        with selectors.DefaultSelector() as selector:
+            for fd in buffers:
+                selector.register(fd, selectors.EVENT_READ)
+            
+            while selector.get_map():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                
+                for key, _ in selector.select(remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        selector.unregister(key.fd)
+                        continue
+                    
+                    dropped[key.fd] += _append_tail(buffers[key.fd], chunk, max_bytes)
+        
+        returncode = process.wait(timeout=max(0, deadline - time.monotonic()))
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        for stream in streams:
+            stream.close()
+    
+    outputs = [_finish_tail(buffer, dropped[fd], max_bytes) for fd, buffer in buffers.items()]
+    return returncode, outputs[0], outputs[1]
+
+
+def _append_tail(buffer: bytearray, chunk: bytes, max_bytes: int) -> int:
+    """
+    Append output to a tail buffer, trimming it once it grows well past max_bytes.
+    
+    Returns:
+        Number of bytes dropped from the front of the buffer
+    """
+    buffer += chunk
+    # Trim in batches so the memmove cost stays amortized
+    if len(buffer) > 2 * max_bytes:
+        excess = len(buffer) - max_bytes
+        del buffer[:excess]
+        return excess
+    return 0
+
+
+def _finish_tail(buffer: bytearray, dropped: int, max_bytes: int) -> bytes:
+    """
+    Trim a tail buffer to max_bytes, marking any dropped output.
+    
+    Returns:
+        The kept output, behind a marker line if anything was dropped
+    """
+    excess = len(buffer) - max_bytes
+    if excess > 0:
+        del buffer[:excess]
+        dropped += excess
+    if dropped:
+        buffer[:0] = b'[... %d bytes truncated ...]\n' % dropped
+    return bytes(buffer)
+
+
+async def _read_tail(stream: 'asyncio.StreamReader', max_bytes: int) -> bytes:
+    """
+    Read an asyncio stream to EOF, keeping only its last max_bytes.
+    
+    Args:
+        stream: Output stream of a subprocess
+        max_bytes: Bytes of output kept
+        
+    Returns:
+        The kept output, as with _run_capped
+    """
+    buffer = bytearray()
+    dropped = 0
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            return _finish_tail(buffer, dropped, max_bytes)
+        dropped += _append_tail(buffer, chunk, max_bytes)
+
+
+def _direct_argv(command: str) -> Optional[List[str]]:
+    """
+    Split a command that needs no shell into an argv for direct execution.
+    
+    Skipping /bin/sh saves an exec per job, and an absolute program path
+    lets subprocess launch through posix_spawn/vfork instead of fork.
+    
+    Args:
+        command: Shell command of a job
+        
+    Returns:
+        argv with an absolute program path, or None if a shell is needed
+        (shell syntax, variable assignments, builtins, or not on POSIX)
+    """
+    if os.name != 'posix' or _SHELL_SYNTAX.search(command):
+        return None
+    
+    argv = command.split()
+    if not argv or '=' in argv[0]:
+        return None
+    
+    program = _which(argv[0])
+    if program is None:
+        return None
+    
+    argv[0] = program
+    return argv
+
 
 class Worker:
     """
@@ -37,7 +244,7 @@ class Worker:
     - Job locking to prevent race conditions
     """
     
-    def __init__(self, worker_id: str, storage: JobStorage, config: Config):
+    def __init__(self, worker_id: str, storage: JobStorage, config: Config, shutdown: Any = None):
         """
         Initialize worker.
         
@@ -45,36 +252,114 @@ class Worker:
             worker_id: Unique worker identifier
             storage: Job storage instance
             config: Configuration instance
+            shutdown: Optional cross-process shutdown signal from the manager:
+                an eventfd that becomes readable, or a multiprocessing Event
         """
         self.worker_id = worker_id
         self.storage = storage
         self.config = config
+        self._shutdown = shutdown
         self.running = False
         self.current_job: Optional[Job] = None
         self.shutdown_requested = False
         
+        # Per-job config values, refreshed whenever the config changes
+        self._refresh_config()
+        config.register_listener(self._refresh_config)
+        
+        # Per-worker jitter source, so workers' retry delays are uncorrelated
+        self._rng = random.Random(hash(worker_id) ^ os.getpid())
+        
+        # Set when there may be new work (or a shutdown) to react to
+        self._wakeup = threading.Event()
+        storage.register_notifier(self.notify)
+        
+        # Long-lived processes for stdin_payload jobs, by command, with the
+        # monotonic time each last finished a job
+        self._persistent_pool: Dict[str, subprocess.Popen] = {}
+        self._pool_last_used: Dict[str, float] = {}
+        
         # Set up signal handlers for graceful shutdown
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        install_signal_handlers(self)
+    
+    def _refresh_config(self):
+        """Re-read the config values used on every job"""
+        self._worker_timeout = self.config.get('worker_timeout', 300)
+        self._backoff_base = self.config.get('backoff_base', 2.0)
+        # backoff_base ** attempts capped at MAX_RETRY_DELAY; later attempts
+        # reuse the last entry. Multiplying saturates at inf where ** raises.
+        self._delays = []
+        delay = 1.0
+        for _ in range(32):
+            self._delays.append(min(delay, MAX_RETRY_DELAY))
+            delay *= self._backoff_base
+        self._max_output_bytes = self.config.get('max_output_bytes', 1024 * 1024)
     
     def _signal_handler(self, signum, frame):
         """Handle shutdown signals gracefully"""
         logger.info(f"Worker {self.worker_id}: Received signal {signum}, initiating graceful shutdown")
+        # Not Event.set(): it takes a lock the interrupted thread may hold.
+        # The idle wait checks the flag between its short slices instead.
         self.shutdown_requested = True
     
+    def notify(self):
+        """Wake the worker if it is idle waiting for jobs"""
+        self._wakeup.set()
+    
+    def _check_shutdown(self) -> bool:
+        """
+        Poll the manager's shutdown signal, if any.
+        
+        Returns:
+            True if a shutdown was requested by any means
+        """
+        shutdown = self._shutdown
+        if not self.shutdown_requested and shutdown is not None:
+            if isinstance(shutdown, int):
+                # Never read: the count stays up so every worker sees it
+                signalled = bool(select.select([shutdown], [], [], 0)[0])
+            else:
+                signalled = shutdown.is_set()
+            if signalled:
+                logger.info(f"Worker {self.worker_id}: Shutdown requested by manager")
+                self.shutdown_requested = True
+        return self.shutdown_requested
+    
+    def _wait_for_work(self, timeout: float = 1.0):
+        """
+        Wait until woken, the jobs files change, or the timeout passes.
+        
+        In-process enqueues and stop() wake the worker through notify();
+        jobs added by other processes and shutdown signals are noticed
+        between 0.1 s waits, a storage change check costing two stat calls.
+        
+        Args:
+            timeout: Maximum time to wait in seconds
+        """
+        signature = self.storage.change_signature()
+        deadline = time.monotonic() + timeout
+        
+        while not self._wakeup.wait(0.1):
+            if (self._check_shutdown() or time.monotonic() >= deadline
+                    or self.storage.change_signature() != signature):
+                break
+        
+        self._wakeup.clear()
+    
     def start(self):
         """Start the worker main loop"""
         self.running = True
         logger.info(f"Worker {self.worker_id}: Starting")
         
         try:
-            while self.running and not self.shutdown_requested:
+            while self.running and not self._check_shutdown():
                 # Get next job
                 job = self.storage.get_next_job(self.worker_id)
                 
                 if job is None:
-                    # No jobs available, wait and continue
-                    time.sleep(1)
+                    # No jobs available, wait for some to arrive
+                    self._close_idle_processes()
+                    self._wait_for_work()
                     continue
                 
                 self.current_job = job
@@ -87,13 +372,14 @@ class Worker:
                     logger.error(f"Worker {self.worker_id}: Error processing job {job.id}: {e}")
                     self._handle_job_failure(job, str(e))
                 finally:
-                    # Unlock the job
-                    self.storage.unlock_job(job.id, self.worker_id)
+                    # Store the outcome and unlock the job in one go
+                    self._finalize_job(job)
                     self.current_job = None
             
         except Exception as e:
             logger.error(f"Worker {self.worker_id}: Fatal error: {e}")
         finally:
+            self._close_persistent_pool()
             self.running = False
             logger.info(f"Worker {self.worker_id}: Stopped")
     
@@ -102,6 +388,7 @@ class Worker:
         logger.info(f"Worker {self.worker_id}: Stop requested")
         self.running = False
         self.shutdown_requested = True
+        self._wakeup.set()
     
     def _execute_job(self, job: Job):
         """
@@ -112,38 +399,196 @@ class Worker:
         """
         job.increment_attempts()
         
+        if job.stdin_payload is not None:
+            self._execute_persistent_job(job)
+            return
+        
         try:
-            # Execute command with timeout
-            result = subprocess.run(
-                job.command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=job.timeout or self.config.get('worker_timeout', 300),
-                cwd=os.getcwd()
-            )
+            # Simple commands skip the shell
+            argv = _direct_argv(job.command)
             
-            # Check return code
-            if result.returncode == 0:
-                # Job succeeded
-                output = result.stdout.strip() if result.stdout else ""
-                job.update_state(JobState.COMPLETED, output=output)
-                logger.info(f"Worker {self.worker_id}: Job {job.id} completed successfully")
+            # Execute command with timeout; output is captured as bytes in
+            # large reads and decoded once, rather than through text wrappers.
+            # Our own descriptors are non-inheritable, so close_fds=False only
+            # keeps the posix_spawn path open; so does leaving out cwd, which
+            # the child inherits from the worker anyway.
+            timeout = job.timeout or self._worker_timeout
+            if os.name == 'nt':
+                # select() does not work on pipes on Windows: output is uncapped
+                result = subprocess.run(
+                    job.command,
+                    shell=True,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    bufsize=65536,
+                    timeout=timeout
+                )
+                returncode, stdout, stderr = result.returncode, result.stdout, result.stderr
             else:
-                # Job failed
-                error = result.stderr.strip() if result.stderr else f"Command failed with return code {result.returncode}"
-                self._handle_job_failure(job, error)
+                returncode, stdout, stderr = _run_capped(
+                    argv if argv is not None else job.command,
+                    argv is None,
+                    timeout,
+                    self._max_output_bytes
+                )
+            
+            self._record_result(job, returncode, stdout, stderr)
                 
         except subprocess.TimeoutExpired:
-            error = f"Job timed out after {job.timeout or self.config.get('worker_timeout', 300)} seconds"
+            error = f"Job timed out after {job.timeout or self._worker_timeout} seconds"
             self._handle_job_failure(job, error)
             
         except Exception as e:
             error = f"Execution error: {str(e)}"
             self._handle_job_failure(job, error)
+    
+    def _finalize_job(self, job: Job):
+        """
+        Store a finished job and release its lock, whatever happened to it.
+        
+        Args:
+            job: Job this worker locked
+        """
+        try:
+            self.storage.finalize_job(job, self.worker_id)
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id}: Could not store job {job.id}: {e}")
+            self.storage.unlock_job(job.id, self.worker_id)
+    
+    def _record_result(self, job: Job, returncode: int, stdout: bytes, stderr: bytes):
+        """
+        Complete or fail a job from its command's exit status and output.
         
-        # Update job in storage
-        self.storage.update_job(job)
+        Args:
+            job: Job that was run
+            returncode: Exit status of its command
+            stdout: Captured standard output
+            stderr: Captured standard error
+        """
+        # Check return code
+        if returncode == 0:
+            # Job succeeded
+            output = stdout.strip().decode('utf-8', errors='replace')
+            job.update_state(JobState.COMPLETED, output=output)
+            logger.info(f"Worker {self.worker_id}: Job {job.id} completed successfully")
+        else:
+            # Job failed
+            if stderr:
+                error = stderr.strip().decode('utf-8', errors='replace')
+            else:
+                error = f"Command failed with return code {returncode}"
+            self._handle_job_failure(job, error)
+    
+    def _execute_persistent_job(self, job: Job):
+        """
+        Execute a job by feeding its payload to a long-lived command process.
+        
+        Args:
+            job: Job with a stdin_payload to execute
+        """
+        timeout = job.timeout or self._worker_timeout
+        
+        try:
+            output = self._run_persistent(job.command, job.stdin_payload, timeout)
+            job.update_state(JobState.COMPLETED, output=output)
+            logger.info(f"Worker {self.worker_id}: Job {job.id} completed successfully")
+        except subprocess.TimeoutExpired:
+            self._handle_job_failure(job, f"Job timed out after {timeout} seconds")
+        except Exception as e:
+            self._handle_job_failure(job, f"Execution error: {str(e)}")
+    
+    def _run_persistent(self, command: str, payload: str, timeout: float) -> str:
+        """
+        Send one line to the command's persistent process and read one back.
+        
+        The process is started on first use and restarted if it has exited.
+        On a timeout or a closed pipe it is killed, since its input and
+        output are no longer in step.
+        
+        Args:
+            command: Shell command of the persistent process
+            payload: Input line for this job
+            timeout: Seconds to wait for the output line
+            
+        Returns:
+            Output line, without its line ending
+        """
+        process = self._persistent_pool.get(command)
+        if process is None or process.poll() is not None:
+            process = subprocess.Popen(
+                command,
+                shell=True,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                # Inherited: an unread stderr pipe could fill up and block it
+                stderr=None,
+                bufsize=65536
+            )
+            self._persistent_pool[command] = process
+        
+        try:
+            process.stdin.write(payload.encode('utf-8') + b'\n')
+            process.stdin.flush()
+            
+            # select() does not work on pipes on Windows; block there instead
+            if os.name != 'nt':
+                ready, _, _ = select.select([process.stdout], [], [], timeout)
+                if not ready:
+                    raise subprocess.TimeoutExpired(command, timeout)
+            
+            line = process.stdout.readline()
+            if not line:
+                raise RuntimeError(f"Persistent process exited with code {process.wait()}")
+        except BaseException:
+            self._close_process(command)
+            raise
+        
+        self._pool_last_used[command] = time.monotonic()
+        return line.rstrip(b'\r\n').decode('utf-8', errors='replace')
+    
+    def _close_process(self, command: str, kill: bool = True):
+        """
+        Shut down one persistent process and forget it.
+        
+        Args:
+            command: Shell command of the process
+            kill: Kill it right away rather than letting it exit on EOF
+        """
+        process = self._persistent_pool.pop(command, None)
+        self._pool_last_used.pop(command, None)
+        if process is None:
+            return
+        
+        try:
+            if not kill:
+                process.stdin.close()
+                try:
+                    process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    pass
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        except OSError:
+            pass
+        finally:
+            process.stdout.close()
+            if not process.stdin.closed:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+    
+    def _close_idle_processes(self):
+        """Shut down persistent processes that have not run a job for a while"""
+        cutoff = time.monotonic() - PERSISTENT_IDLE_TIMEOUT
+        for command in [c for c, last in self._pool_last_used.items() if last < cutoff]:
+            self._close_process(command, kill=False)
+    
+    def _close_persistent_pool(self):
+        """Shut down all persistent processes, letting them exit on EOF"""
+        for command in list(self._persistent_pool):
+            self._close_process(command, kill=False)
     
     def _handle_job_failure(self, job: Job, error: str):
         """
@@ -153,21 +598,22 @@ class Worker:
             job: Failed job
             error: Error message
         """
-        job.update_state(JobState.FAILED, error=error)
-        
-        if job.should_retry():
-            # Schedule retry with exponential backoff
-            delay = job.get_retry_delay(self.config.get('backoff_base', 2.0))
-            logger.info(f"Worker {self.worker_id}: Job {job.id} failed (attempt {job.attempts}), retrying in {delay} seconds")
+        # The job goes straight to its next state: a failed job would only
+        # pass through FAILED (cf. Job.should_retry) on its way there
+        if job.attempts < job.max_retries:
+            # Schedule retry with exponential backoff and full jitter, so jobs
+            # that failed together do not all retry in lockstep
+            delay = self._rng.uniform(0, self._delays[min(job.attempts, 31)])
+            logger.info("Worker %s: Job %s failed (attempt %d), retrying in %.2f seconds",
+                        self.worker_id, job.id, job.attempts, delay)
             
-            # For simplicity, we'll reset to pending state immediately
-            # In a production system, you might want to implement scheduled retries
-            time.sleep(min(delay, 60))  # Cap delay at 60 seconds for responsiveness
-            job.update_state(JobState.PENDING)
+            # Back to pending right away; storage holds the job back until
+            # retry_at, so this worker is free to run other jobs meanwhile
+            job.schedule_retry(delay, error=error)
         else:
             # Move to dead letter queue
-            logger.warning(f"Worker {self.worker_id}: Job {job.id} exceeded max retries, moving to DLQ")
-            job.update_state(JobState.DEAD)
+            logger.warning("Worker %s: Job %s exceeded max retries, moving to DLQ", self.worker_id, job.id)
+            job.update_state(JobState.DEAD, error=error)
     
     def get_status(self) -> Dict:
         """
@@ -184,24 +630,187 @@ class Worker:
         }
 
 
-def _run_worker_process(worker_id: str, storage_dir: str):
+class AsyncWorker(Worker):
+    """
+    Worker that runs several jobs at once on an asyncio event loop.
+    
+    For I/O-bound commands one AsyncWorker process can stand in for many
+    Worker processes: its jobs' subprocesses run concurrently while the
+    process itself mostly waits on their pipes. Storage calls block, so
+    they go to the loop's default thread pool.
+    """
+    
+    def __init__(self, worker_id: str, storage: JobStorage, config: Config,
+                 concurrency: int = 4, shutdown: Any = None):
+        """
+        Initialize async worker.
+        
+        Args:
+            worker_id: Unique worker identifier
+            storage: Job storage instance
+            config: Configuration instance
+            concurrency: Maximum number of jobs run at once
+            shutdown: Optional cross-process shutdown signal, see Worker
+        """
+        super().__init__(worker_id, storage, config, shutdown)
+        self.concurrency = max(1, concurrency)
+        self.current_jobs: Dict[str, Job] = {}
+        
+        # The persistent pool is shared by the jobs in flight
+        self._pool_lock = threading.Lock()
+    
+    def start(self):
+        """Start the worker main loop"""
+        self.running = True
+        logger.info(f"Worker {self.worker_id}: Starting ({self.concurrency} concurrent jobs)")
+        
+        try:
+            asyncio.run(self._run())
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id}: Fatal error: {e}")
+        finally:
+            self._close_persistent_pool()
+            self.running = False
+            logger.info(f"Worker {self.worker_id}: Stopped")
+    
+    async def _run(self):
+        """Keep up to concurrency jobs in flight until shut down"""
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        
+        try:
+            while self.running and not self._check_shutdown():
+                # Fill the free slots
+                while len(tasks) < self.concurrency:
+                    job = await loop.run_in_executor(None, self.storage.get_next_job, self.worker_id)
+                    if job is None:
+                        break
+                    tasks.add(loop.create_task(self._process_job(job)))
+                
+                if tasks:
+                    # Look for new jobs once one finishes, or now and then
+                    # when all slots are busy with long jobs
+                    _, tasks = await asyncio.wait(tasks, timeout=1.0, return_when=asyncio.FIRST_COMPLETED)
+                else:
+                    # No jobs available, wait for some to arrive
+                    self._close_idle_processes()
+                    await loop.run_in_executor(None, self._wait_for_work)
+        finally:
+            # Let the jobs in flight finish, as Worker does with its one job
+            if tasks:
+                await asyncio.wait(tasks)
+    
+    async def _process_job(self, job: Job):
+        """
+        Run one job and release it.
+        
+        Args:
+            job: Locked job to run
+        """
+        loop = asyncio.get_running_loop()
+        self.current_jobs[job.id] = job
+        logger.info(f"Worker {self.worker_id}: Processing job {job.id}")
+        
+        try:
+            await self._execute_job_async(job)
+        except Exception as e:
+            logger.error(f"Worker {self.worker_id}: Error processing job {job.id}: {e}")
+            self._handle_job_failure(job, str(e))
+        finally:
+            # Store the outcome and unlock the job in one go
+            await loop.run_in_executor(None, self._finalize_job, job)
+            del self.current_jobs[job.id]
+    
+    async def _execute_job_async(self, job: Job):
+        """
+        Execute a job command without blocking the event loop.
+        
+        Args:
+            job: Job to execute
+        """
+        loop = asyncio.get_running_loop()
+        job.increment_attempts()
+        
+        if job.stdin_payload is not None:
+            await loop.run_in_executor(None, self._execute_persistent_job_locked, job)
+            return
+        
+        timeout = job.timeout or self._worker_timeout
+        try:
+            # Simple commands skip the shell
+            argv = _direct_argv(job.command)
+            if argv is not None:
+                process = await asyncio.create_subprocess_exec(
+                    *argv, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+            else:
+                process = await asyncio.create_subprocess_shell(
+                    job.command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+                )
+            
+            try:
+                stdout, stderr, returncode = await asyncio.wait_for(
+                    asyncio.gather(
+                        _read_tail(process.stdout, self._max_output_bytes),
+                        _read_tail(process.stderr, self._max_output_bytes),
+                        process.wait()
+                    ),
+                    timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise subprocess.TimeoutExpired(job.command, timeout)
+            
+            self._record_result(job, returncode, stdout, stderr)
+            
+        except subprocess.TimeoutExpired:
+            error = f"Job timed out after {timeout} seconds"
+            self._handle_job_failure(job, error)
+            
+        except Exception as e:
+            error = f"Execution error: {str(e)}"
+            self._handle_job_failure(job, error)
+    
+    def _execute_persistent_job_locked(self, job: Job):
+        """Run a stdin_payload job on a pool thread, one at a time"""
+        with self._pool_lock:
+            self._execute_persistent_job(job)
+    
+    def get_status(self) -> Dict:
+        """
+        Get worker status.
+        
+        Returns:
+            Dictionary with worker status information
+        """
+        status = super().get_status()
+        status['current_job'] = next(iter(self.current_jobs), None)
+        status['current_jobs'] = list(self.current_jobs)
+        status['concurrency'] = self.concurrency
+        return status
+
+
+def _run_worker_process(worker_id: str, storage_dir: str, shutdown: Any = None, concurrency: int = 1):
     """
     Run worker in separate process (standalone function to avoid pickle issues).
     
     Args:
         worker_id: Worker identifier
         storage_dir: Storage directory path
+        shutdown: Manager's shutdown signal, see Worker
+        concurrency: Jobs run at once; above 1 an AsyncWorker is used
     """
     try:
         # Create fresh storage and config instances in the worker process
         # to avoid pickle issues with thread locks on Windows
-        from queuectl.storage import JobStorage
-        from queuectl.config import Config
-        
         storage = JobStorage(storage_dir)
         config = Config()
         
-        worker = Worker(worker_id, storage, config)
+        if concurrency > 1:
+            worker = AsyncWorker(worker_id, storage, config, concurrency, shutdown)
+        else:
+            worker = Worker(worker_id, storage, config, shutdown)
         worker.start()
     except Exception as e:
         logger.error(f"Worker {worker_id} crashed: {e}")
@@ -230,17 +839,29 @@ class WorkerManager:
         self.workers: Dict[str, multiprocessing.Process] = {}
         self.worker_threads: Dict[str, threading.Thread] = {}
         self.running = False
-        self.shutdown_event = multiprocessing.Event()
+        
+        # Fork starts a worker in well under a millisecond where spawn
+        # re-imports everything; JobStorage resets its locks, threads and
+        # descriptors after fork. Other platforms lack a safe fork.
+        self._ctx = multiprocessing.get_context('fork' if sys.platform == 'linux' else 'spawn')
+        self.shutdown_event = self._ctx.Event()
+        
+        # Forked workers inherit an eventfd and poll it without any locking;
+        # spawned ones get the Event instead
+        self._shutdown_efd: Optional[int] = None
+        if self._ctx.get_start_method() == 'fork' and hasattr(os, 'eventfd'):
+            self._shutdown_efd = os.eventfd(0, os.EFD_CLOEXEC)
         
         # Create PID file for tracking
         self.pid_file = Path(storage.storage_dir) / "workers.pid"
     
-    def start_workers(self, count: int = 1) -> List[str]:
+    def start_workers(self, count: int = 1, concurrency: int = 1) -> List[str]:
         """
         Start worker processes.
         
         Args:
             count: Number of workers to start
+            concurrency: Jobs each worker runs at once (see AsyncWorker)
             
         Returns:
             List of worker IDs started
@@ -251,9 +872,14 @@ class WorkerManager:
             worker_id = f"worker-{int(time.time())}-{i}"
             
             # Create worker process
-            process = multiprocessing.Process(
+            process = self._ctx.Process(
                 target=_run_worker_process,
-                args=(worker_id, str(self.storage.storage_dir)),
+                args=(
+                    worker_id,
+                    str(self.storage.storage_dir),
+                    self._shutdown_efd if self._shutdown_efd is not None else self.shutdown_event,
+                    concurrency
+                ),
                 name=f"queuectl-{worker_id}"
             )
             
@@ -282,43 +908,75 @@ class WorkerManager:
         
         logger.info(f"Stopping {len(self.workers)} workers...")
         
+        processes = list(self.workers.items())
+        
         if graceful:
-            # Signal all workers to stop gracefully
-            self.shutdown_event.set()
+            # Signal all workers to stop gracefully, then wait for current
+            # jobs to finish against one shared deadline
+            self._signal_shutdown()
+            self._join_all(processes, timeout)
             
-            # Wait for workers to finish current jobs
-            start_time = time.time()
-            for worker_id, process in self.workers.items():
-                remaining_time = max(0, timeout - (time.time() - start_time))
-                if remaining_time > 0:
-                    process.join(timeout=remaining_time)
-                
-                if process.is_alive():
-                    logger.warning(f"Worker {worker_id} did not stop gracefully, terminating")
-                    process.terminate()
-                    process.join(timeout=5)
-                    
-                    if process.is_alive():
-                        logger.error(f"Worker {worker_id} did not respond to termination, killing")
-                        process.kill()
-                        process.join()
+            stragglers = [(worker_id, process) for worker_id, process in processes if process.is_alive()]
+            for worker_id, process in stragglers:
+                logger.warning(f"Worker {worker_id} did not stop gracefully, terminating")
         else:
             # Force stop all workers
-            for worker_id, process in self.workers.items():
-                if process.is_alive():
-                    process.terminate()
-                    process.join(timeout=5)
-                    
-                    if process.is_alive():
-                        process.kill()
-                        process.join()
+            stragglers = processes
+        
+        # Terminate everything left at once, then kill what still hangs on
+        self._terminate_all(stragglers)
         
         self.workers.clear()
         self.running = False
         self._cleanup_pid_file()
+        self._reset_shutdown()
         
         logger.info("All workers stopped")
     
+    def _signal_shutdown(self):
+        """Ask every worker to finish its current job and exit"""
+        self.shutdown_event.set()
+        if self._shutdown_efd is not None:
+            os.eventfd_write(self._shutdown_efd, 1)
+    
+    def _reset_shutdown(self):
+        """Clear the shutdown signal so workers started later keep running"""
+        if self.shutdown_event.is_set():
+            self.shutdown_event.clear()
+            if self._shutdown_efd is not None:
+                os.eventfd_read(self._shutdown_efd)
+    
+    def _join_all(self, processes: List[Tuple[str, multiprocessing.Process]], timeout: float):
+        """
+        Join processes until they exit or a shared deadline passes.
+        
+        Args:
+            processes: (worker_id, process) pairs
+            timeout: Seconds from now for all of them together
+        """
+        deadline = time.monotonic() + timeout
+        for _, process in processes:
+            process.join(timeout=max(0, deadline - time.monotonic()))
+    
+    def _terminate_all(self, processes: List[Tuple[str, multiprocessing.Process]], grace: float = 5):
+        """
+        Terminate processes together, killing those that outlast the grace period.
+        
+        Args:
+            processes: (worker_id, process) pairs
+            grace: Seconds to wait after terminating before killing
+        """
+        live = [(worker_id, process) for worker_id, process in processes if process.is_alive()]
+        for _, process in live:
+            process.terminate()
+        self._join_all(live, grace)
+        
+        for worker_id, process in live:
+            if process.is_alive():
+                logger.error(f"Worker {worker_id} did not respond to termination, killing")
+                process.kill()
+                process.join()
+    
     def get_worker_status(self) -> List[Dict]:
         """
         Get status of all workers.
@@ -326,25 +984,56 @@ class WorkerManager:
         Returns:
             List of worker status dictionaries
         """
+        dead = self._reap()
         status_list = []
         
         for worker_id, process in self.workers.items():
+            alive = worker_id not in dead
             status = {
                 'worker_id': worker_id,
                 'pid': process.pid,
-                'alive': process.is_alive(),
-                'exitcode': process.exitcode
+                'alive': alive,
+                'exitcode': None if alive else process.exitcode
             }
             status_list.append(status)
         
         return status_list
     
+    def _reap(self) -> List[str]:
+        """
+        Find and reap exited workers with a single readiness check.
+        
+        A process sentinel becomes ready when the process exits, so one
+        wait() call over all of them replaces an is_alive() waitpid per
+        worker; only the exited ones are joined. A raw waitpid(-1) would
+        also reap them, but behind multiprocessing's back, leaving their
+        Process objects reporting alive forever.
+        
+        Returns:
+            IDs of the workers that have exited
+        """
+        by_sentinel = {process.sentinel: worker_id for worker_id, process in self.workers.items()}
+        if not by_sentinel:
+            return []
+        
+        dead = [by_sentinel[sentinel] for sentinel in
+                multiprocessing.connection.wait(list(by_sentinel), timeout=0)]
+        for worker_id in dead:
+            self.workers[worker_id].join()
+        
+        return dead
+    
     def _update_pid_file(self):
         """Update PID file with current worker PIDs"""
+        # Written aside and renamed over, so readers never see a partial file
+        tmp_file = self.pid_file.with_suffix('.pid.tmp')
         try:
             pids = [str(process.pid) for process in self.workers.values()]
-            with open(self.pid_file, 'w') as f:
+            with open(tmp_file, 'w') as f:
                 f.write('\n'.join(pids))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.pid_file)
         except Exception as e:
             logger.warning(f"Could not update PID file: {e}")
     
@@ -358,11 +1047,7 @@ class WorkerManager:
     
     def cleanup_dead_workers(self):
         """Remove dead worker processes from tracking"""
-        dead_workers = []
-        
-        for worker_id, process in self.workers.items():
-            if not process.is_alive():
-                dead_workers.append(worker_id)
+        dead_workers = self._reap()
         
         for worker_id in dead_workers:
             del self.workers[worker_id]
@@ -391,10 +1076,17 @@ def get_running_workers(storage_dir: Optional[str] = None) -> List[int]:
         return []
     
     try:
-        with open(pid_file, 'r') as f:
-            pids = [int(line.strip()) for line in f if line.strip()]
+        pids = list(map(int, pid_file.read_text().split()))
+        
+        # Verify PIDs are still running: one /proc listing on Linux covers
+        # every PID, where signalling costs a syscall each
+        if sys.platform == 'linux':
+            try:
+                live = {int(name) for name in os.listdir('/proc') if name.isdigit()}
+                return [pid for pid in pids if pid in live]
+            except OSError:
+                pass
         
-        # Verify PIDs are still running
         running_pids = []
         for pid in pids:
             try:
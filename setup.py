@@ -53,9 +53,13 @@ setup(
         "dev": [
             "pytest>=6.0",
             "pytest-cov>=2.0",
+            "pytest-xdist>=2.0",
             "black>=21.0",
             "flake8>=3.8",
-        ]
+        ],
+        "fast": [
+            "orjson>=3.6",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,85 @@
+"""
+Shared helpers for the QueueCTL tests
+"""
+
+import os
+import tempfile
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from queuectl.job import Job, JobState
+
+
+def fast_tmpdir() -> str:
+    """
+    Create a temporary directory for test storage.
+    
+    With QUEUECTL_TEST_SHM=1 it is created on /dev/shm where that exists,
+    so the many small fsync'd JSON writes never reach a disk.
+    
+    Returns:
+        Path of the new directory
+    """
+    if os.environ.get('QUEUECTL_TEST_SHM') == '1' and os.path.isdir('/dev/shm'):
+        return tempfile.mkdtemp(dir='/dev/shm')
+    return tempfile.mkdtemp()
+
+
+class InMemoryJobStorage:
+    """
+    Dictionary-backed stand-in for JobStorage in tests of the DLQ logic.
+    
+    Implements only the calls DeadLetterQueue and its tests make. Jobs are
+    kept as to_dict() records, so callers never alias stored state, and
+    change_signature() is a write counter.
+    """
+    
+    def __init__(self):
+        self._jobs: Dict[str, Dict] = {}
+        self._version = 0
+    
+    def add_job(self, job: Job) -> bool:
+        return self.add_jobs([job])[0]
+    
+    def add_jobs(self, jobs: List[Job]) -> List[bool]:
+        results = []
+        for job in jobs:
+            results.append(job.id not in self._jobs)
+            if results[-1]:
+                self._jobs[job.id] = job.to_dict()
+        self._version += 1
+        return results
+    
+    def get_job(self, job_id: str) -> Optional[Job]:
+        job_data = self._jobs.get(job_id)
+        return Job.from_dict(job_data) if job_data is not None else None
+    
+    def update_job(self, job: Job) -> bool:
+        return self.update_jobs([job])[job.id]
+    
+    def update_jobs(self, jobs: List[Job]) -> Dict[str, bool]:
+        results = {}
+        for job in jobs:
+            results[job.id] = job.id in self._jobs
+            if results[job.id]:
+                self._jobs[job.id] = job.to_dict()
+        self._version += 1
+        return results
+    
+    def delete_job(self, job_id: str) -> bool:
+        return self.delete_jobs([job_id])[job_id]
+    
+    def delete_jobs(self, job_ids: List[str]) -> Dict[str, bool]:
+        self._version += 1
+        return {job_id: self._jobs.pop(job_id, None) is not None for job_id in job_ids}
+    
+    def list_jobs(self, state: Optional[JobState] = None, limit: Optional[int] = None) -> List[Job]:
+        jobs = sorted(self.iter_jobs(state), key=lambda job: (-job.priority, job.created_ns))
+        return jobs if limit is None else jobs[:limit]
+    
+    def iter_jobs(self, state: Optional[JobState] = None) -> Iterator[Job]:
+        for job_data in list(self._jobs.values()):
+            if state is None or job_data['state'] == state.value:
+                yield Job.from_dict(job_data)
+    
+    def change_signature(self) -> Tuple:
+        return (self._version,)
@@ -4,17 +4,28 @@ Basic functionality tests for QueueCTL
 Tests job creation, storage, and basic queue operations.
 """
 
+import json
 import os
-import tempfile
+import random
+import shutil
+import subprocess
+import threading
+import time
 import unittest
+from datetime import datetime, timezone
 from pathlib import Path
+from unittest import mock
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
 from queuectl.job import Job, JobState
+from queuectl import storage as storage_module
 from queuectl.storage import JobStorage
 from queuectl.config import Config
+from queuectl.utils import format_table_row
+from queuectl.worker import AsyncWorker, Worker, _direct_argv, _run_capped, get_running_workers
+from support import fast_tmpdir
 
 
 class TestBasicFunctionality(unittest.TestCase):
@@ -22,13 +33,13 @@ class TestBasicFunctionality(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment"""
-        self.temp_dir = tempfile.mkdtemp()
+        self.temp_dir = fast_tmpdir()
         self.storage = JobStorage(self.temp_dir)
         self.config = Config(self.temp_dir)
     
     def tearDown(self):
         """Clean up test environment"""
-        import shutil
+        self.storage.close()
         shutil.rmtree(self.temp_dir, ignore_errors=True)
     
     def test_job_creation(self):
@@ -42,6 +53,16 @@ class TestBasicFunctionality(unittest.TestCase):
         self.assertEqual(job.max_retries, 3)
         self.assertIsNotNone(job.created_at)
         self.assertIsNotNone(job.updated_at)
+        
+        # created_ns always follows created_at, however it is spelled
+        job.created_at = "2024-01-01T00:00:00Z"
+        self.assertEqual(job.created_ns, 1704067200 * 10 ** 9)
+        job.created_at = "2024-01-01T01:00:00+01:00"
+        self.assertEqual(job.created_ns, 1704067200 * 10 ** 9)
+    
+    def test_format_table_row(self):
+        """Test table rows pad short values and mark truncated ones"""
+        self.assertEqual(format_table_row(["abcdefghij", "x"], [6, 3]), "abc... | x  ")
     
     def test_job_serialization(self):
         """Test job JSON serialization/deserialization"""
@@ -117,6 +138,19 @@ class TestBasicFunctionality(unittest.TestCase):
         deleted_job = self.storage.get_job("storage-test")
         self.assertIsNone(deleted_job)
     
+    def test_batch_add(self):
+        """Test adding several jobs in one write"""
+        jobs = [
+            Job.create("echo 'a'", job_id="batch-a"),
+            Job.create("echo 'b'", job_id="batch-b"),
+            Job.create("echo 'dup'", job_id="batch-a")
+        ]
+        
+        # Duplicates within the batch are rejected like existing IDs
+        self.assertEqual(self.storage.add_jobs(jobs), [True, True, False])
+        self.assertEqual(len(self.storage.list_jobs()), 2)
+        self.assertEqual(self.storage.add_jobs(jobs[:1]), [False])
+    
     def test_job_listing(self):
         """Test job listing and filtering"""
         # Create test jobs
@@ -176,6 +210,88 @@ class TestBasicFunctionality(unittest.TestCase):
         self.assertEqual(counts['completed'], 1)
         self.assertEqual(counts['failed'], 1)
     
+    def test_counts_snapshot(self):
+        """Test cached job counts follow storage writes"""
+        self.assertEqual(self.storage.get_counts_snapshot()['pending'], 0)
+        
+        self.storage.add_job(Job.create("echo 'one'", job_id="snap-1"))
+        self.assertEqual(self.storage.get_counts_snapshot()['pending'], 1)
+        
+        # Writes from another storage instance are picked up as well
+        other = JobStorage(self.temp_dir)
+        other.add_job(Job.create("echo 'two'", job_id="snap-2"))
+        self.assertEqual(self.storage.get_counts_snapshot()['pending'], 2)
+    
+    def test_state_index(self):
+        """Test state filters and counts follow updates, deletes and other writers"""
+        job = Job.create("echo 'moving'", job_id="moving")
+        self.storage.add_jobs([job, Job.create("echo 'gone'", job_id="gone")])
+        
+        job.update_state(JobState.COMPLETED)
+        self.storage.update_job(job)
+        self.storage.delete_job("gone")
+        
+        counts = self.storage.get_job_counts()
+        self.assertEqual((counts['pending'], counts['completed']), (0, 1))
+        self.assertEqual([j.id for j in self.storage.list_jobs(state=JobState.COMPLETED)], ["moving"])
+        
+        other = JobStorage(self.temp_dir)
+        other.add_job(Job.create("echo 'new'", job_id="new"))
+        other.close()
+        self.assertEqual([j.id for j in self.storage.list_jobs(state=JobState.PENDING)], ["new"])
+    
+    def test_iter_jobs(self):
+        """Test lazy job iteration with a state filter"""
+        dead = Job.create("echo 'dead'", job_id="iter-dead")
+        dead.update_state(JobState.DEAD)
+        self.storage.add_jobs([Job.create("echo 'live'", job_id="iter-live"), dead])
+        
+        self.assertEqual({job.id for job in self.storage.iter_jobs()}, {"iter-live", "iter-dead"})
+        self.assertEqual([job.id for job in self.storage.iter_jobs(JobState.DEAD)], ["iter-dead"])
+    
+    def test_jobs_log(self):
+        """Test mutations go through the jobs log and survive a torn tail"""
+        self.storage.add_job(Job.create("echo 'logged'", job_id="logged"))
+        self.assertGreater(self.storage.jobs_log.stat().st_size, 0)
+        
+        # A crash mid-append leaves a partial record behind
+        with open(self.storage.jobs_log, 'ab') as f:
+            f.write(b'{"op":"put","id":"torn"')
+        
+        other = JobStorage(self.temp_dir)
+        self.assertIsNone(other.get_job("torn"))
+        self.assertTrue(other.add_job(Job.create("echo 'after'", job_id="after")))
+        self.assertEqual({job.id for job in self.storage.list_jobs()}, {"logged", "after"})
+        other.close()
+    
+    def test_jobs_log_compaction(self):
+        """Test the jobs log is folded into the snapshot once it outgrows it"""
+        self.storage.add_job(Job.create("echo 'first'", job_id="first"))
+        
+        # Another instance compacts behind this one's cached view
+        other = JobStorage(self.temp_dir)
+        with mock.patch.object(storage_module, 'COMPACT_MIN_BYTES', 0):
+            other.add_job(Job.create("echo 'compact'", job_id="compact"))
+        other.close()
+        
+        self.assertEqual(self.storage.jobs_log.stat().st_size, 0)
+        self.assertIn("compact", json.loads(self.storage.jobs_file.read_text()))
+        self.assertEqual({job.id for job in self.storage.list_jobs()}, {"first", "compact"})
+    
+    def test_concurrent_writes(self):
+        """Test writes from many threads are all committed"""
+        def add_batch(prefix):
+            for i in range(25):
+                self.assertTrue(self.storage.add_job(Job.create("echo 'x'", job_id=f"{prefix}-{i}")))
+        
+        threads = [threading.Thread(target=add_batch, args=(f"t{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(len(JobStorage(self.temp_dir).list_jobs()), 100)
+    
     def test_next_job_retrieval(self):
         """Test getting next job for worker"""
         # Add test jobs
@@ -201,6 +317,194 @@ class TestBasicFunctionality(unittest.TestCase):
         next_job3 = self.storage.get_next_job("worker-3")
         self.assertIsNone(next_job3)
     
+    def test_cleanup_expired_locks(self):
+        """Test the lock sweep expires old locks, including other instances' locks"""
+        self.storage.add_jobs([Job.create("echo 'a'", job_id="lock-a"), Job.create("echo 'b'", job_id="lock-b")])
+        self.storage.get_next_job("worker-1")
+        
+        other = JobStorage(self.temp_dir)
+        other.get_next_job("worker-2")
+        other.close()
+        
+        self.storage.cleanup_expired_locks(max_age_seconds=300)
+        self.assertEqual(len(json.loads(self.storage.locks_file.read_text())), 2)
+        
+        self.storage.cleanup_expired_locks(max_age_seconds=-1)
+        self.assertEqual(json.loads(self.storage.locks_file.read_text()), {})
+    
+    def test_finalize_job(self):
+        """Test finalizing stores the job and releases only its owner's lock"""
+        self.storage.add_jobs([Job.create("echo 'a'", job_id="fin-a"), Job.create("echo 'b'", job_id="fin-b")])
+        job_a = self.storage.get_next_job("worker-1")
+        job_b = self.storage.get_next_job("worker-1")
+        
+        job_a.update_state(JobState.COMPLETED, output="a")
+        self.assertTrue(self.storage.finalize_job(job_a, "worker-1"))
+        self.assertTrue(self.storage.finalize_job(job_b, "worker-2"))
+        
+        self.assertEqual(self.storage.get_job("fin-a").output, "a")
+        self.assertEqual(list(json.loads(self.storage.locks_file.read_text())), ["fin-b"])
+    
+    def test_retry_jitter(self):
+        """Test retries are scheduled within [0, base ** attempts] from now"""
+        with mock.patch("queuectl.worker.signal.signal"):
+            worker = Worker("jitter-worker", self.storage, self.config)
+        worker._rng = random.Random(42)
+        
+        for attempts in range(1, 4):
+            job = Job.create("false", max_retries=5, attempts=attempts)
+            before = datetime.now(timezone.utc)
+            worker._handle_job_failure(job, "boom")
+            
+            delay = (datetime.fromisoformat(job.retry_at) - before).total_seconds()
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, 2 ** attempts + 1)
+            self.assertEqual(job.state, JobState.PENDING)
+            self.assertEqual(job.error, "boom")
+        
+        # Out of retries: dead, keeping the last error
+        job = Job.create("false", max_retries=5, attempts=5)
+        worker._handle_job_failure(job, "final")
+        self.assertEqual((job.state, job.error, job.retry_at), (JobState.DEAD, "final", None))
+        
+        # Steep backoff stays capped at a minute rather than overflowing
+        self.config.set('backoff_base', 10.0)
+        job = Job.create("false", max_retries=50, attempts=14)
+        before = datetime.now(timezone.utc)
+        worker._handle_job_failure(job, "boom")
+        self.assertLessEqual((datetime.fromisoformat(job.retry_at) - before).total_seconds(), 61)
+        
+        # schedule_retry itself clamps delays datetime cannot represent
+        job.schedule_retry(1e15)
+        self.assertGreater(datetime.fromisoformat(job.retry_at), before)
+    
+    def test_same_timestamp_fifo(self):
+        """Test jobs created within one clock tick are dequeued in creation order"""
+        job_ids = [f"z{i:02d}" for i in range(19, -1, -1)]
+        with mock.patch("queuectl.job.time.time_ns", return_value=time.time_ns()):
+            jobs = [Job.create("echo 'fifo'", job_id=job_id) for job_id in job_ids]
+        self.storage.add_jobs(jobs)
+        
+        dequeued = [self.storage.get_next_job("worker-1").id for _ in job_ids]
+        self.assertEqual(dequeued, job_ids)
+        self.assertEqual([job.id for job in self.storage.list_jobs()], job_ids)
+    
+    def test_scheduled_retry(self):
+        """Test a job with a future retry_at is held back until it is due"""
+        waiting = Job.create("echo 'waiting'", job_id="waiting", priority=10)
+        waiting.schedule_retry(3600)
+        self.storage.add_jobs([waiting, Job.create("echo 'ready'", job_id="ready")])
+        
+        self.assertEqual(self.storage.get_next_job("worker-1").id, "ready")
+        self.assertIsNone(self.storage.get_next_job("worker-1"))
+        
+        # Once due it is picked up again, by this and fresh instances alike
+        waiting.schedule_retry(0)
+        self.storage.update_job(waiting)
+        self.assertEqual(JobStorage(self.temp_dir).get_job("waiting").retry_at, waiting.retry_at)
+        self.assertEqual(self.storage.get_next_job("worker-1").id, "waiting")
+    
+    def test_worker_wakeup(self):
+        """Test an idle worker is woken by enqueues instead of sleeping out its poll"""
+        with mock.patch("queuectl.worker.signal.signal"):
+            worker = Worker("idle-worker", self.storage, self.config)
+        
+        self.storage.add_job(Job.create("echo 'wake'"))
+        start = time.monotonic()
+        worker._wait_for_work(timeout=30)
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertFalse(worker._wakeup.is_set())
+    
+    def test_persistent_command(self):
+        """Test stdin_payload jobs share one long-lived command process"""
+        with mock.patch("queuectl.worker.signal.signal"):
+            worker = Worker("pool-worker", self.storage, self.config)
+        
+        command = "while read line; do echo \"got $line\"; done"
+        jobs = [Job.create(command, stdin_payload=str(i)) for i in range(2)]
+        self.storage.add_jobs(jobs)
+        
+        for job in jobs:
+            worker._execute_job(job)
+        
+        self.assertEqual([job.output for job in jobs], ["got 0", "got 1"])
+        self.assertEqual(len(worker._persistent_pool), 1)
+        
+        process = worker._persistent_pool[command]
+        worker._close_persistent_pool()
+        self.assertEqual(process.returncode, 0)
+    
+    def test_direct_exec(self):
+        """Test only commands without shell syntax bypass the shell"""
+        self.assertTrue(os.path.isabs(_direct_argv("echo hello")[0]))
+        for command in ["echo $HOME", "exit 2", "FOO=1 env", "true && false", "no-such-program"]:
+            self.assertIsNone(_direct_argv(command), command)
+    
+    def test_worker_in_thread(self):
+        """Test a worker can be built outside the main thread"""
+        errors = []
+        
+        def build():
+            try:
+                Worker("thread-worker", self.storage, self.config)
+            except Exception as e:
+                errors.append(e)
+        
+        thread = threading.Thread(target=build)
+        thread.start()
+        thread.join()
+        self.assertEqual(errors, [])
+    
+    def test_async_worker(self):
+        """Test an AsyncWorker runs its jobs concurrently"""
+        with mock.patch("queuectl.worker.signal.signal"):
+            worker = AsyncWorker("async-worker", self.storage, self.config, concurrency=4)
+        
+        # Each job logs its start, then waits until all three have started
+        marks = Path(self.temp_dir, "marks")
+        command = (f"echo start >> {marks}; "
+                   f"while [ $(grep -c start {marks}) -lt 3 ]; do sleep 0.05; done; "
+                   f"echo end >> {marks}")
+        jobs = [Job.create(command, timeout=10, max_retries=0) for _ in range(3)]
+        jobs.append(Job.create("exit 1", max_retries=0))
+        self.storage.add_jobs(jobs)
+        
+        thread = threading.Thread(target=worker.start)
+        start = time.monotonic()
+        thread.start()
+        try:
+            while sum(map(self.storage.get_job_counts().get, ("completed", "dead"))) < len(jobs):
+                self.assertLess(time.monotonic() - start, 60)
+                time.sleep(0.05)
+        finally:
+            worker.stop()
+            thread.join()
+        
+        # Run one at a time, the first job would have timed out instead
+        self.assertEqual(marks.read_text().split(), ["start"] * 3 + ["end"] * 3)
+        self.assertEqual(self.storage.get_job(jobs[-1].id).state, JobState.DEAD)
+        self.assertEqual(worker.current_jobs, {})
+    
+    def test_running_workers(self):
+        """Test only live PIDs from the PID file are reported"""
+        process = subprocess.Popen(["true"])
+        process.wait()
+        Path(self.temp_dir, "workers.pid").write_text(f"{os.getpid()}\n{process.pid}\n")
+        
+        self.assertEqual(get_running_workers(self.temp_dir), [os.getpid()])
+        with mock.patch("queuectl.worker.sys.platform", "win32"):
+            self.assertEqual(get_running_workers(self.temp_dir), [os.getpid()])
+    
+    def test_output_cap(self):
+        """Test only the tail of oversized job output is kept"""
+        returncode, stdout, stderr = _run_capped("yes | head -c 100000; echo done", True, 10, 1024)
+        
+        self.assertEqual(returncode, 0)
+        self.assertTrue(stdout.startswith(b"[... "))
+        self.assertTrue(stdout.endswith(b"y\ndone\n"))
+        self.assertLess(len(stdout), 1100)
+        self.assertEqual(stderr, b"")
+    
     def test_retry_logic(self):
         """Test job retry logic"""
         job = Job.create("echo 'test'", max_retries=2)
@@ -4,9 +4,11 @@ Dead Letter Queue tests for QueueCTL
 Tests DLQ functionality, retry mechanisms, and failure analysis.
 """
 
-import tempfile
+import os
+import shutil
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
@@ -14,6 +16,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 from queuectl.job import Job, JobState
 from queuectl.storage import JobStorage
 from queuectl.dlq import DeadLetterQueue
+from support import InMemoryJobStorage, fast_tmpdir
 
 
 class TestDeadLetterQueue(unittest.TestCase):
@@ -21,15 +24,10 @@ class TestDeadLetterQueue(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.storage = JobStorage(self.temp_dir)
+        # The DLQ logic needs no durability; JobStorage itself is covered below
+        self.storage = InMemoryJobStorage()
         self.dlq = DeadLetterQueue(self.storage)
     
-    def tearDown(self):
-        """Clean up test environment"""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
     def test_list_dead_jobs(self):
         """Test listing dead jobs"""
         # Initially empty
@@ -47,8 +45,7 @@ class TestDeadLetterQueue(unittest.TestCase):
         jobs[1].update_state(JobState.DEAD)
         jobs[2].update_state(JobState.COMPLETED)
         
-        for job in jobs:
-            self.storage.add_job(job)
+        self.storage.add_jobs(jobs)
         
         # Should only return dead jobs
         dead_jobs = self.dlq.list_dead_jobs()
@@ -134,11 +131,10 @@ class TestDeadLetterQueue(unittest.TestCase):
         for job in dead_jobs:
             job.update_state(JobState.DEAD)
             job.attempts = 3
-            self.storage.add_job(job)
         
         # Add a live job (should not be affected)
         live_job = Job.create("echo 'live'", job_id="live")
-        self.storage.add_job(live_job)
+        self.storage.add_jobs(dead_jobs + [live_job])
         
         # Retry all dead jobs
         results = self.dlq.retry_all_jobs(reset_attempts=True)
@@ -179,14 +175,13 @@ class TestDeadLetterQueue(unittest.TestCase):
     def test_clear_all(self):
         """Test clearing all jobs from DLQ"""
         # Add multiple dead jobs
-        for i in range(3):
-            job = Job.create(f"echo 'job{i}'", job_id=f"job{i}")
+        jobs = [Job.create(f"echo 'job{i}'", job_id=f"job{i}") for i in range(3)]
+        for job in jobs:
             job.update_state(JobState.DEAD)
-            self.storage.add_job(job)
         
         # Add live job
         live_job = Job.create("echo 'live'", job_id="live")
-        self.storage.add_job(live_job)
+        self.storage.add_jobs(jobs + [live_job])
         
         # Clear all dead jobs
         results = self.dlq.clear_all()
@@ -201,6 +196,41 @@ class TestDeadLetterQueue(unittest.TestCase):
         live_job = self.storage.get_job("live")
         self.assertIsNotNone(live_job)
     
+    def test_batch_retry_and_clear(self):
+        """Test retry-all and clear-all each take a single storage write"""
+        jobs = [Job.create(f"echo 'batch{i}'", job_id=f"batch{i}") for i in range(3)]
+        for job in jobs:
+            job.schedule_retry(3600)
+            job.update_state(JobState.DEAD, error="Test error")
+            job.attempts = 3
+        self.storage.add_jobs(jobs)
+        
+        # Retry all in one write, runnable right away
+        with mock.patch.object(self.storage, "update_job", side_effect=AssertionError), \
+                mock.patch.object(self.storage, "update_jobs", wraps=self.storage.update_jobs) as update_jobs:
+            results = self.dlq.retry_all_jobs(reset_attempts=True)
+        update_jobs.assert_called_once()
+        self.assertEqual(set(results), {"batch0", "batch1", "batch2"})
+        
+        for job_id in results:
+            job = self.storage.get_job(job_id)
+            self.assertEqual((job.state, job.attempts, job.error, job.retry_at),
+                             (JobState.PENDING, 0, None, None))
+        
+        # Move two back to the DLQ and clear them in one write
+        for job_id in ["batch0", "batch1"]:
+            job = self.storage.get_job(job_id)
+            job.update_state(JobState.DEAD)
+            self.storage.update_job(job)
+        
+        with mock.patch.object(self.storage, "delete_job", side_effect=AssertionError), \
+                mock.patch.object(self.storage, "delete_jobs", wraps=self.storage.delete_jobs) as delete_jobs:
+            results = self.dlq.clear_all()
+        delete_jobs.assert_called_once()
+        self.assertEqual(set(results), {"batch0", "batch1"})
+        self.assertIsNone(self.storage.get_job("batch0"))
+        self.assertIsNotNone(self.storage.get_job("batch2"))
+    
     def test_dlq_statistics(self):
         """Test DLQ statistics"""
         # Empty DLQ
@@ -223,8 +253,7 @@ class TestDeadLetterQueue(unittest.TestCase):
         jobs[2].update_state(JobState.DEAD, error="Command not found")
         jobs[2].attempts = 1
         
-        for job in jobs:
-            self.storage.add_job(job)
+        self.storage.add_jobs(jobs)
         
         # Check statistics
         stats = self.dlq.get_statistics()
@@ -239,6 +268,58 @@ class TestDeadLetterQueue(unittest.TestCase):
         self.assertIsNotNone(stats['oldest_job'])
         self.assertIsNotNone(stats['newest_job'])
     
+    def test_statistics_track_removals(self):
+        """Test DLQ statistics stay correct as jobs leave the DLQ"""
+        for i, error in enumerate(["Command not found", "Permission denied",
+                                   "Command not found", "Timeout"]):
+            job = Job.create(f"echo 'stat{i}'", job_id=f"stat{i}")
+            job.update_state(JobState.DEAD, error=error)
+            job.created_at = f"2024-01-0{i + 1}T00:00:00Z"
+            job.attempts = i + 1
+            self.storage.add_job(job)
+        
+        self.assertEqual(self.dlq.get_statistics()['total_jobs'], 4)
+        
+        # Jobs leaving the DLQ drop out of the summary
+        self.assertTrue(self.dlq.remove_job("stat1"))
+        self.assertTrue(self.dlq.retry_job("stat2"))
+        stats = self.dlq.get_statistics()
+        self.assertEqual(stats['total_jobs'], 2)
+        self.assertEqual(stats['average_attempts'], 2.5)  # (1+4)/2
+        self.assertEqual(stats['common_errors'], {"Command not found": 1, "Timeout": 1})
+        
+        # Including the oldest job
+        self.assertTrue(self.dlq.remove_job("stat0"))
+        stats = self.dlq.get_statistics()
+        self.assertEqual(stats['total_jobs'], 1)
+        self.assertEqual(stats['oldest_job']['id'], "stat3")
+        
+        # Jobs dying outside this DLQ instance are picked up
+        job = Job.create("echo 'late'", job_id="late")
+        job.update_state(JobState.DEAD, error="Timeout")
+        self.storage.add_job(job)
+        self.assertEqual(self.dlq.get_statistics()['total_jobs'], 2)
+        
+        # Even when they land right after this instance's own write
+        middle = Job.create("echo 'middle'", job_id="middle")
+        middle.update_state(JobState.DEAD, error="Timeout")
+        middle.created_at = "2024-01-05T00:00:00Z"
+        self.storage.add_job(middle)
+        self.assertEqual(self.dlq.get_statistics()['total_jobs'], 3)
+        
+        racing = Job.create("echo 'racing'", job_id="racing")
+        racing.update_state(JobState.DEAD, error="Timeout")
+        delete_job = self.storage.delete_job
+        
+        def delete_then_race(job_id):
+            result = delete_job(job_id)
+            self.storage.add_job(racing)
+            return result
+        
+        with mock.patch.object(self.storage, "delete_job", side_effect=delete_then_race):
+            self.assertTrue(self.dlq.remove_job("middle"))
+        self.assertEqual(self.dlq.get_statistics()['total_jobs'], 3)
+    
     def test_failure_analysis(self):
         """Test job failure analysis"""
         # Create job with specific error
@@ -281,11 +362,59 @@ class TestDeadLetterQueue(unittest.TestCase):
         ]
         
         for error_msg, expected_type, expected_retryable in test_cases:
-            analysis = self.dlq._analyze_error(error_msg)
-            self.assertEqual(analysis['error_type'], expected_type, 
-                           f"Failed for error: {error_msg}")
-            self.assertEqual(analysis['is_retryable'], expected_retryable,
-                           f"Wrong retryable status for: {error_msg}")
+            with self.subTest(error=error_msg):
+                analysis = self.dlq._analyze_error(error_msg)
+                self.assertEqual(analysis['error_type'], expected_type)
+                self.assertEqual(analysis['is_retryable'], expected_retryable)
+
+
+
+class TestJobStorageFilePersistence(unittest.TestCase):
+    """Test DLQ operations against the on-disk JobStorage"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Create one storage directory shared by all tests"""
+        cls.temp_dir = fast_tmpdir()
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared storage directory"""
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
+    
+    def setUp(self):
+        """Set up test environment"""
+        # Empty the shared directory; it only ever holds flat files
+        with os.scandir(self.temp_dir) as entries:
+            for entry in entries:
+                os.unlink(entry.path)
+        
+        self.storage = JobStorage(self.temp_dir)
+        self.dlq = DeadLetterQueue(self.storage)
+    
+    def tearDown(self):
+        """Clean up test environment"""
+        self.storage.close()
+    
+    def test_dlq_changes_persist(self):
+        """Test DLQ retries and removals reach the files"""
+        jobs = [Job.create(f"echo 'disk{i}'", job_id=f"disk{i}") for i in range(3)]
+        for job in jobs:
+            job.update_state(JobState.DEAD, error="Timeout")
+        self.storage.add_jobs(jobs)
+        
+        self.assertTrue(self.dlq.retry_job("disk0"))
+        self.assertTrue(self.dlq.remove_job("disk1"))
+        self.storage.close()
+        
+        # A fresh instance sees only what was written to disk
+        reopened = JobStorage(self.temp_dir)
+        try:
+            self.assertEqual(reopened.get_job("disk0").state, JobState.PENDING)
+            self.assertIsNone(reopened.get_job("disk1"))
+            self.assertEqual([job.id for job in DeadLetterQueue(reopened).list_dead_jobs()], ["disk2"])
+        finally:
+            reopened.close()
 
 
 if __name__ == '__main__':
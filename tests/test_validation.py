@@ -5,11 +5,18 @@ Basic tests to validate the core functionality works.
 """
 
 import os
-import tempfile
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+try:
+    import pytest
+    integration = pytest.mark.integration
+except ImportError:  # pytest is only needed for the marker, not as a script
+    def integration(func):
+        return func
+
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
@@ -17,6 +24,7 @@ from queuectl.job import Job, JobState
 from queuectl.storage import JobStorage
 from queuectl.config import Config
 from queuectl.dlq import DeadLetterQueue
+from support import fast_tmpdir
 
 
 def test_job_creation():
@@ -36,7 +44,7 @@ def test_storage_operations():
     """Test storage operations"""
     print("Testing storage operations...")
     
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = fast_tmpdir()
     try:
         storage = JobStorage(temp_dir)
         
@@ -60,7 +68,6 @@ def test_storage_operations():
         print("✓ Storage operations test passed")
         
     finally:
-        import shutil
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
@@ -94,7 +101,7 @@ def test_dlq_basic():
     """Test basic DLQ functionality"""
     print("Testing DLQ basic functionality...")
     
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = fast_tmpdir()
     try:
         storage = JobStorage(temp_dir)
         dlq = DeadLetterQueue(storage)
@@ -121,7 +128,6 @@ def test_dlq_basic():
         print("✓ DLQ basic test passed")
         
     finally:
-        import shutil
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
@@ -129,7 +135,7 @@ def test_config():
     """Test configuration"""
     print("Testing configuration...")
     
-    temp_dir = tempfile.mkdtemp()
+    temp_dir = fast_tmpdir()
     try:
         config = Config(temp_dir)
         
@@ -144,37 +150,41 @@ def test_config():
         # Test validation
         assert config.set('max_retries', -1) == False  # Invalid
         
+        # Invalid values in a loaded config fall back to defaults
+        loaded = Config(temp_dir, {'max_retries': -1, 'backoff_base': 3.0})
+        assert loaded.get('max_retries') == 3
+        assert loaded.get('backoff_base') == 3.0
+        
+        # Listeners see every applied change
+        changes = []
+        config.register_listener(lambda: changes.append(config.get('backoff_base')))
+        config.set('backoff_base', 4.0)
+        config.reset_to_defaults()
+        assert changes == [4.0, 2.0]
+        
         print("✓ Configuration test passed")
         
     finally:
-        import shutil
         shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+@integration
 def test_command_execution():
-    """Test actual command execution"""
+    """Test actual command execution (spawns a process; deselected by default under pytest)"""
     print("Testing command execution...")
     
-    try:
-        # Simple echo command
-        result = subprocess.run(
-            "echo hello",
-            shell=True,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
-        
-        assert result.returncode == 0
-        assert "hello" in result.stdout
-        
-        print("✓ Command execution test passed")
-        
-    except Exception as e:
-        print(f"✗ Command execution test failed: {e}")
-        return False
+    # Simple echo command, run directly rather than through a shell
+    result = subprocess.run(
+        ["echo", "hello"],
+        capture_output=True,
+        text=True,
+        timeout=5
+    )
+    
+    assert result.returncode == 0
+    assert "hello" in result.stdout
     
-    return True
+    print("✓ Command execution test passed")
 
 
 def run_all_tests():